@@ -9,12 +9,84 @@ import sys
 import json
 import time
 import signal
+import select
+import secrets
 import subprocess
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 import psutil
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _read_json(file_path: Path) -> Any:
+    """读取小型JSON文件（优先使用orjson直接解析字节）"""
+    data = file_path.read_bytes()
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _pid_alive(pid: int) -> bool:
+    """检查进程是否存在（POSIX下使用单次kill(pid, 0)系统调用）"""
+    if sys.platform == "win32":
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+# PID/锁文件中需要转换为整数/浮点数的字段
+_INT_FIELDS = ("pid", "locked_by")
+_FLOAT_FIELDS = ("create_time",)
+
+
+def _read_kv(file_path: Path) -> Dict[str, Any]:
+    """读取key=value格式的PID/锁文件（兼容旧版JSON格式）"""
+    text = file_path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("{"):
+        return json.loads(text)
+
+    data: Dict[str, Any] = dict(
+        line.split("=", 1) for line in text.splitlines() if "=" in line
+    )
+    for key in _INT_FIELDS:
+        if key in data:
+            data[key] = int(data[key])
+    for key in _FLOAT_FIELDS:
+        if key in data:
+            data[key] = float(data[key])
+    return data
+
+
+def _write_kv(file_path: Path, data: Dict[str, Any]) -> None:
+    """以每行一个key=value的格式写入PID/锁文件"""
+    file_path.write_text(
+        "".join(f"{key}={value}\n" for key, value in data.items()), encoding="utf-8"
+    )
+
+
+# 目录修改时间距今不足该值时不复用目录列表缓存（粗粒度时间戳的文件系统上，
+# 同一时间刻度内的多次创建/删除不会改变mtime）
+_DIR_LISTING_SETTLE_NS = 2_000_000_000
+
+# 当前进程PID（进程生命周期内不变）
+_CURRENT_PID = os.getpid()
+
+# 守护进程启动时屏蔽的信号（由task_executor在安装处理器后解除）
+_DAEMON_BLOCKED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
 
 class DaemonManager:
     """守护进程管理器"""
@@ -24,52 +96,169 @@ class DaemonManager:
         self.daemon_dir = data_dir / "daemons"
         self.daemon_dir.mkdir(parents=True, exist_ok=True)
 
+        # 进程对象缓存：pid -> (Process, create_time)，用于检测PID复用
+        self._proc_cache: Dict[int, Tuple[psutil.Process, float]] = {}
+
+        # 守护进程目录列表缓存：((目录mtime_ns, ctime_ns, size), 按平台分组的文件条目)
+        self._dir_listing: Optional[
+            Tuple[Tuple[int, int, int], Dict[str, Dict[str, os.DirEntry]]]
+        ] = None
+
+        # 快速路径检查时已解析的状态文件内容：platform -> status，供随后的状态查询复用
+        self._checked_status: Dict[str, Dict[str, Any]] = {}
+
+    def _get_process(self, pid: int) -> psutil.Process:
+        """获取缓存的进程对象，PID被复用时重新创建"""
+        cached = self._proc_cache.get(pid)
+        if cached:
+            proc, create_time = cached
+            try:
+                if proc.create_time() == create_time:
+                    return proc
+            except psutil.NoSuchProcess:
+                self._proc_cache.pop(pid, None)
+                raise
+
+        try:
+            proc = psutil.Process(pid)
+            self._proc_cache[pid] = (proc, proc.create_time())
+        except psutil.NoSuchProcess:
+            self._proc_cache.pop(pid, None)
+            raise
+        return proc
+
+    def _process_create_time(self, pid: int) -> Optional[float]:
+        """获取进程创建时间，进程不存在或无权访问时返回None"""
+        try:
+            return self._get_process(pid).create_time()
+        except psutil.NoSuchProcess:
+            self._proc_cache.pop(pid, None)
+            return None
+        except psutil.AccessDenied:
+            return None
+
+    def _verified_process(
+        self, platform: str, pid_data: Dict[str, Any]
+    ) -> Optional[psutil.Process]:
+        """完整确认PID仍属于该平台的守护进程（创建时间与命令行均匹配）
+
+        PID可能已被系统复用给无关进程，发送信号前必须通过此检查。
+        """
+        pid = pid_data["pid"]
+        try:
+            proc = self._get_process(pid)
+            with proc.oneshot():
+                create_time = pid_data.get("create_time")
+                if create_time is not None and proc.create_time() != create_time:
+                    return None
+                cmdline = " ".join(proc.cmdline())
+        except psutil.NoSuchProcess:
+            self._proc_cache.pop(pid, None)
+            return None
+        except psutil.AccessDenied:
+            return None
+
+        if "task_executor.py" in cmdline and platform in cmdline:
+            return proc
+        return None
+
     def get_daemon_files(self, platform: str) -> Dict[str, Path]:
         """获取守护进程相关文件路径"""
         return {
             "lock": self.daemon_dir / f"{platform}.lock",
             "pid": self.daemon_dir / f"{platform}.pid",
             "status": self.daemon_dir / f"{platform}.status",
+            # 守护进程写状态文件时使用的临时文件（崩溃时可能残留）
+            "status_tmp": self.daemon_dir / f"{platform}.status.tmp",
             "log": self.daemon_dir / f"{platform}.log",
         }
 
+    def _scan_daemon_dir(self) -> Dict[str, Dict[str, os.DirEntry]]:
+        """单次遍历守护进程目录，按平台分组文件条目
+
+        目录的mtime/ctime/size在文件创建/删除/重命名时变化，未变化时直接复用上次结果；
+        mtime距今不足2秒时时间戳可能尚未体现同一刻度内的后续变化，此时总是重新扫描。
+        """
+        dir_stat = os.stat(self.daemon_dir)
+        dir_key = (dir_stat.st_mtime_ns, dir_stat.st_ctime_ns, dir_stat.st_size)
+        if (
+            self._dir_listing is not None
+            and self._dir_listing[0] == dir_key
+            and time.time_ns() - dir_stat.st_mtime_ns >= _DIR_LISTING_SETTLE_NS
+        ):
+            return self._dir_listing[1]
+
+        platforms: Dict[str, Dict[str, os.DirEntry]] = {}
+        with os.scandir(self.daemon_dir) as it:
+            for entry in it:
+                stem, _, kind = entry.name.rpartition(".")
+                if stem:
+                    platforms.setdefault(stem, {})[kind] = entry
+
+        self._dir_listing = (dir_key, platforms)
+        return platforms
+
     def is_daemon_running(self, platform: str) -> bool:
         """检查指定平台的守护进程是否正在运行"""
+        return self._check_daemon(platform)[0]
+
+    def _check_daemon(
+        self, platform: str, entries: Optional[Dict[str, os.DirEntry]] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """检查守护进程是否运行，并返回已解析的PID数据
+
+        entries为预先扫描的文件条目时跳过stat。
+        """
         files = self.get_daemon_files(platform)
+        self._checked_status.pop(platform, None)
+
+        def exists(kind: str) -> bool:
+            if entries is not None:
+                return kind in entries
+            return files[kind].exists()
 
         # 1. 检查锁文件是否存在
-        if not files["lock"].exists():
-            return False
+        if not exists("lock"):
+            return False, None
 
         # 2. 检查PID文件是否存在
-        if not files["pid"].exists():
+        if not exists("pid"):
             self._cleanup_daemon_files(platform)
-            return False
+            return False, None
 
         # 3. 读取PID并检查进程是否存在
         try:
-            with open(files["pid"], "r", encoding="utf-8") as f:
-                pid_data = json.load(f)
-                pid = pid_data.get("pid")
-
-            if pid and psutil.pid_exists(pid):
-                # 进一步验证进程是否是我们的守护进程
-                try:
-                    proc = psutil.Process(pid)
-                    # 检查进程名称或命令行参数来确认
-                    cmdline = " ".join(proc.cmdline())
-                    if "task_executor.py" in cmdline and platform in cmdline:
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+            pid_data = _read_kv(files["pid"])
+            pid = pid_data.get("pid")
+
+            if pid and _pid_alive(pid):
+                # 快速路径：比较PID文件与守护进程状态文件中的验证令牌；
+                # 状态文件可能由已被SIGKILL的守护进程遗留，PID被复用时其内容
+                # 仍为"running"，因此还需确认进程创建时间与启动时记录的一致
+                verify_token = pid_data.get("verify_token")
+                create_time = pid_data.get("create_time")
+                if verify_token and create_time is not None and exists("status"):
+                    daemon_status = _read_json(files["status"])
+                    if (
+                        daemon_status.get("verify_token") == verify_token
+                        and daemon_status.get("pid") == pid
+                        and daemon_status.get("status") != "stopped"
+                        and self._process_create_time(pid) == create_time
+                    ):
+                        self._checked_status[platform] = daemon_status
+                        return True, pid_data
+
+                # 进一步验证进程是否是我们的守护进程（创建时间与命令行）
+                if self._verified_process(platform, pid_data) is not None:
+                    return True, pid_data
 
             # PID无效，清理文件
             self._cleanup_daemon_files(platform)
-            return False
+            return False, None
 
         except Exception:
             self._cleanup_daemon_files(platform)
-            return False
+            return False, None
 
     def start_daemon(self, platform: str, config: Dict[str, Any]) -> bool:
         """启动指定平台的守护进程"""
@@ -80,19 +269,21 @@ class DaemonManager:
         files = self.get_daemon_files(platform)
 
         try:
+            now_iso = datetime.now().isoformat()
+
             # 1. 创建锁文件
             lock_data = {
                 "platform": platform,
-                "locked_at": datetime.now().isoformat(),
-                "locked_by": os.getpid(),
+                "locked_at": now_iso,
+                "locked_by": _CURRENT_PID,
             }
 
-            with open(files["lock"], "w", encoding="utf-8") as f:
-                json.dump(lock_data, f, indent=2)
+            _write_kv(files["lock"], lock_data)
 
             # 2. 构建守护进程启动命令
             script_dir = Path(__file__).parent
             executor_script = script_dir / "task_executor.py"
+            verify_token = secrets.token_hex(8)
 
             cmd = [
                 sys.executable,
@@ -103,35 +294,32 @@ class DaemonManager:
                 str(self.data_dir),
                 "--config",
                 json.dumps(config),
+                "--verify-token",
+                verify_token,
             ]
 
             # 3. 启动守护进程（后台模式）
-            log_file = open(files["log"], "a", encoding="utf-8")
-
-            proc = subprocess.Popen(
-                cmd,
-                stdout=log_file,
-                stderr=log_file,
-                stdin=subprocess.DEVNULL,
-                start_new_session=True,  # 创建新的进程组，避免信号传播
-            )
+            pid = self._spawn_daemon(cmd, files["log"])
 
-            # 4. 记录PID信息
+            # 4. 记录PID信息（含进程创建时间，用于识别PID复用）
             pid_data = {
-                "pid": proc.pid,
+                "pid": pid,
                 "platform": platform,
-                "started_at": datetime.now().isoformat(),
+                "started_at": now_iso,
                 "command": " ".join(cmd),
+                "verify_token": verify_token,
             }
+            create_time = self._process_create_time(pid)
+            if create_time is not None:
+                pid_data["create_time"] = create_time
 
-            with open(files["pid"], "w", encoding="utf-8") as f:
-                json.dump(pid_data, f, indent=2)
+            _write_kv(files["pid"], pid_data)
 
-            # 5. 等待短暂时间确认启动成功
-            time.sleep(2)
+            # 5. 等待守护进程就绪后确认启动成功
+            self._wait_daemon_ready(files["status"], verify_token)
             if self.is_daemon_running(platform):
                 print(
-                    f"Daemon for platform {platform} started successfully (PID: {proc.pid})"
+                    f"Daemon for platform {platform} started successfully (PID: {pid})"
                 )
                 return True
             else:
@@ -144,6 +332,73 @@ class DaemonManager:
             self._cleanup_daemon_files(platform)
             return False
 
+    def _wait_daemon_ready(
+        self, status_path: Path, verify_token: str, timeout: float = 2.0
+    ) -> bool:
+        """等待守护进程写入带有本次验证令牌的状态文件
+
+        以5ms起步、上限500ms的指数退避轮询，总时长不超过timeout秒。
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while True:
+            try:
+                if _read_json(status_path).get("verify_token") == verify_token:
+                    return True
+            except (OSError, ValueError):
+                pass  # 状态文件尚未写入或正在写入
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+
+    def _spawn_daemon(self, cmd: List[str], log_path: Path) -> int:
+        """在新会话中启动守护进程，返回PID
+
+        POSIX下使用posix_spawn（glibc内部为vfork语义），避免fork复制
+        父进程页表；其他平台回退到subprocess.Popen。
+        """
+        # 直接以追加模式打开日志fd传给子进程，父进程侧设置CLOEXEC并在启动后关闭
+        log_fd = os.open(
+            log_path,
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_CLOEXEC", 0),
+            0o644,
+        )
+        try:
+            if hasattr(os, "posix_spawn"):
+                try:
+                    return os.posix_spawn(
+                        cmd[0],
+                        cmd,
+                        os.environ,
+                        file_actions=[
+                            (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                            (os.POSIX_SPAWN_DUP2, log_fd, 1),
+                            (os.POSIX_SPAWN_DUP2, log_fd, 2),
+                        ],
+                        setsid=True,  # 创建新的会话，避免信号传播
+                        # 子进程安装信号处理器前先屏蔽SIGINT/SIGTERM，
+                        # 由task_executor安装处理器后解除屏蔽，避免中途被杀
+                        setsigmask=_DAEMON_BLOCKED_SIGNALS,
+                    )
+                except (NotImplementedError, TypeError, OSError):
+                    # 平台或Python构建不支持setsid等参数（如3.13之前的macOS），
+                    # 回退到Popen
+                    pass
+
+            proc = subprocess.Popen(
+                cmd,
+                stdout=log_fd,
+                stderr=log_fd,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,  # 创建新的进程组，避免信号传播
+            )
+            return proc.pid
+        finally:
+            os.close(log_fd)
+
     def stop_daemon(self, platform: str) -> bool:
         """停止指定平台的守护进程"""
         files = self.get_daemon_files(platform)
@@ -153,32 +408,36 @@ class DaemonManager:
             return True
 
         try:
-            # 读取PID
-            with open(files["pid"], "r", encoding="utf-8") as f:
-                pid_data = json.load(f)
-                pid = pid_data.get("pid")
-
-            if pid and psutil.pid_exists(pid):
+            # 读取PID（仅停止已确认的守护进程）
+            running, pid_data = self._check_daemon(platform)
+
+            if running:
+                pid = pid_data["pid"]
+                # 发送信号前完整确认进程身份，避免误杀复用该PID的无关进程
+                proc = self._verified_process(platform, pid_data)
+                if proc is None:
+                    print(
+                        f"PID {pid} no longer belongs to the daemon for platform {platform}, skipping signal"
+                    )
+                    running = False
+
+            if running:
                 # 尝试优雅停止
                 try:
-                    proc = psutil.Process(pid)
                     proc.terminate()
 
-                    # 等待进程结束
-                    for i in range(10):  # 最多等待10秒
-                        if not psutil.pid_exists(pid):
-                            break
-                        time.sleep(1)
-
-                    # 如果仍然存在，强制杀死
-                    if psutil.pid_exists(pid):
+                    # 等待进程结束（最多等待10秒）
+                    if not self._wait_pid_exit(pid, 10_000):
+                        # 如果仍然存在，强制杀死
                         proc.kill()
-                        time.sleep(1)
+                        self._wait_pid_exit(pid, 2000)
 
                     print(f"Daemon for platform {platform} stopped")
 
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
+                finally:
+                    self._proc_cache.pop(pid, None)
 
             # 清理文件
             self._cleanup_daemon_files(platform)
@@ -188,8 +447,43 @@ class DaemonManager:
             print(f"Error stopping daemon for platform {platform}: {e}")
             return False
 
+    def _wait_pid_exit(self, pid: int, timeout_ms: int) -> bool:
+        """等待进程退出，返回进程是否已退出
+
+        优先使用pidfd_open + poll（Linux 5.3+），进程退出时立即唤醒；
+        不支持时回退到按秒轮询。
+        """
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except (AttributeError, OSError):
+            pidfd = None
+
+        if pidfd is not None:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                return bool(poller.poll(timeout_ms))
+            finally:
+                os.close(pidfd)
+
+        # 回退：轮询检查进程是否存在
+        deadline = time.monotonic() + timeout_ms / 1000
+        while _pid_alive(pid):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(min(1, max(0, deadline - time.monotonic())))
+        return True
+
     def get_daemon_status(self, platform: str) -> Dict[str, Any]:
         """获取守护进程状态信息"""
+        return self._status_from_entries(platform)
+
+    def _status_from_entries(
+        self, platform: str, entries: Optional[Dict[str, os.DirEntry]] = None
+    ) -> Dict[str, Any]:
+        """根据预先扫描的文件条目构建状态信息，避免重复stat"""
         files = self.get_daemon_files(platform)
 
         status = {
@@ -203,47 +497,60 @@ class DaemonManager:
         }
 
         try:
-            if self.is_daemon_running(platform):
+            running, pid_data = self._check_daemon(platform, entries)
+            if running:
                 status["running"] = True
 
-                # 读取PID信息
-                if files["pid"].exists():
-                    with open(files["pid"], "r", encoding="utf-8") as f:
-                        pid_data = json.load(f)
-                        status["pid"] = pid_data.get("pid")
-                        status["started_at"] = pid_data.get("started_at")
-
-                # 读取状态信息
-                if files["status"].exists():
-                    with open(files["status"], "r", encoding="utf-8") as f:
-                        daemon_status = json.load(f)
-                        status["last_activity"] = daemon_status.get("last_activity")
-                        status["task_stats"] = daemon_status.get("task_stats", {})
+                # PID信息已在检查时解析，无需重新读取
+                status["pid"] = pid_data.get("pid")
+                status["started_at"] = pid_data.get("started_at")
+
+                # 读取状态信息（快速路径已解析过时直接复用；
+                # 否则直接读取，文件不存在时跳过，省去额外的stat）
+                daemon_status = self._checked_status.pop(platform, None)
+                if daemon_status is None:
+                    try:
+                        daemon_status = _read_json(files["status"])
+                    except FileNotFoundError:
+                        daemon_status = None
+                if daemon_status:
+                    status["last_activity"] = daemon_status.get("last_activity")
+                    status["task_stats"] = daemon_status.get("task_stats", {})
 
         except Exception as e:
             status["error"] = str(e)
 
         return status
 
+    def _map_platforms(self, func, items: List[Tuple[str, Any]]) -> List[Any]:
+        """对每个平台执行检查，平台较多时使用线程池并发执行I/O"""
+        if len(items) <= 2:
+            return [func(platform, entries) for platform, entries in items]
+
+        with ThreadPoolExecutor(max_workers=min(len(items), 8)) as executor:
+            return list(executor.map(lambda item: func(*item), items))
+
+    def _locked_platforms(self) -> List[Tuple[str, Dict[str, os.DirEntry]]]:
+        """扫描守护进程目录，返回持有锁文件的平台及其文件条目"""
+        return [
+            (platform, entries)
+            for platform, entries in self._scan_daemon_dir().items()
+            if "lock" in entries
+        ]
+
     def list_daemons(self) -> List[Dict[str, Any]]:
         """列出所有守护进程状态"""
-        daemons = []
-
         # 遍历守护进程目录，查找所有平台
-        for lock_file in self.daemon_dir.glob("*.lock"):
-            platform = lock_file.stem
-            status = self.get_daemon_status(platform)
-            daemons.append(status)
-
-        return daemons
+        return self._map_platforms(self._status_from_entries, self._locked_platforms())
 
     def cleanup_stale_daemons(self) -> int:
         """清理僵尸守护进程文件"""
-        cleaned = 0
+        platforms = self._locked_platforms()
+        results = self._map_platforms(self._check_daemon, platforms)
 
-        for lock_file in self.daemon_dir.glob("*.lock"):
-            platform = lock_file.stem
-            if not self.is_daemon_running(platform):
+        cleaned = 0
+        for (platform, _), (running, _) in zip(platforms, results):
+            if not running:
                 self._cleanup_daemon_files(platform)
                 cleaned += 1
 
@@ -255,9 +562,9 @@ class DaemonManager:
 
         for file_path in files.values():
             try:
-                file_path.unlink(missing_ok=True)
-            except Exception:
-                pass
+                os.unlink(file_path)
+            except OSError:
+                pass  # 文件不存在或无法删除
 
     def ensure_daemon_running(self, platform: str, config: Dict[str, Any]) -> bool:
         """确保指定平台的守护进程正在运行"""
@@ -266,6 +573,19 @@ class DaemonManager:
         return True
 
 
+# 全局守护进程管理器实例（按数据目录区分）
+_daemon_managers: Dict[Path, DaemonManager] = {}
+
+
+def get_daemon_manager(data_dir: Path) -> DaemonManager:
+    """获取指定数据目录的全局守护进程管理器实例"""
+    key = Path(data_dir).resolve()
+    manager = _daemon_managers.get(key)
+    if manager is None:
+        manager = _daemon_managers[key] = DaemonManager(data_dir)
+    return manager
+
+
 def main():
     """命令行工具入口"""
     import argparse
@@ -4,13 +4,14 @@
 平台后台任务集成接口 - 将后台任务系统与现有平台代码集成
 """
 
+import os
 import json
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
-from .daemon_manager import DaemonManager
+from .daemon_manager import get_daemon_manager
 
 
 class BackgroundTaskIntegration:
@@ -20,7 +21,52 @@ class BackgroundTaskIntegration:
         self.data_dir = data_dir
         self.task_dir = data_dir / "tasks"
         self.task_dir.mkdir(parents=True, exist_ok=True)
-        self.daemon_manager = DaemonManager(data_dir)
+        self.daemon_manager = get_daemon_manager(data_dir)
+
+        # 余额缓存解析结果：platform -> (mtime_ns, size, balance_data, cached_at_epoch)
+        self._balance_memo: Dict[
+            str, Tuple[int, int, Optional[Dict[str, Any]], Optional[float]]
+        ] = {}
+
+        # 健康检查结果缓存：platform -> (检查时间monotonic, 是否健康)
+        self._health_ttl: Dict[str, Tuple[float, bool]] = {}
+
+        # 已打开的余额缓存文件：platform -> (fd, inode)，文件变化时用pread重读
+        self._fds: Dict[str, Tuple[int, int]] = {}
+
+    def _close_cache_fd(self, platform: str) -> None:
+        """关闭并移除指定平台缓存文件的fd"""
+        held = self._fds.pop(platform, None)
+        if held:
+            try:
+                os.close(held[0])
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """关闭所有已打开的缓存文件fd"""
+        for platform in list(getattr(self, "_fds", ())):
+            self._close_cache_fd(platform)
+
+    def __del__(self):
+        """析构时释放缓存文件fd"""
+        self.close()
+
+    def _read_cache_bytes(self, platform: str, cache_file: Path, stat) -> bytes:
+        """读取缓存文件内容，同一inode复用已打开的fd"""
+        if not hasattr(os, "pread"):
+            return cache_file.read_bytes()
+
+        held = self._fds.get(platform)
+        if held is None or held[1] != stat.st_ino:
+            # 文件被替换（inode变化）或首次读取，重新打开
+            self._close_cache_fd(platform)
+            fd = os.open(cache_file, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+            held = self._fds[platform] = (fd, os.fstat(fd).st_ino)
+
+        # 读取长度取自实际读取的fd：调用方stat之后文件可能已被os.replace替换，
+        # 此时fd指向新inode，沿用旧的st_size会截断或读出不完整的JSON
+        return os.pread(held[0], os.fstat(held[0]).st_size, 0)
 
     def ensure_background_tasks(self, platform: str, config: Dict[str, Any]) -> bool:
         """确保指定平台的后台任务正在运行"""
@@ -32,24 +78,48 @@ class BackgroundTaskIntegration:
         """从后台任务缓存获取余额数据（不触发API调用）"""
         cache_file = self.task_dir / f"{platform}_balance_task.json"
 
-        if not cache_file.exists():
+        try:
+            stat = os.stat(cache_file)
+        except OSError:
+            self._balance_memo.pop(platform, None)
+            self._close_cache_fd(platform)
             return None
 
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+            # 文件未变化时复用上次的解析结果
+            memo = self._balance_memo.get(platform)
+            if memo and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+                balance_data, cached_at_epoch = memo[2], memo[3]
+            else:
+                cache_data = json.loads(
+                    self._read_cache_bytes(platform, cache_file, stat)
+                )
+
+                # 优先使用epoch时间戳，兼容只有ISO时间字符串的旧缓存文件
+                cached_at_epoch = cache_data.get("cached_at_epoch")
+                if cached_at_epoch is None:
+                    cached_at_str = cache_data.get("cached_at")
+                    if cached_at_str:
+                        cached_at_epoch = datetime.fromisoformat(
+                            cached_at_str
+                        ).timestamp()
+                balance_data = cache_data.get("balance_data")
+                self._balance_memo[platform] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    balance_data,
+                    cached_at_epoch,
+                )
 
             # 检查缓存时间（10分钟内的数据认为是有效的）
-            cached_at_str = cache_data.get("cached_at")
-            if cached_at_str:
-                cached_at = datetime.fromisoformat(cached_at_str)
-                age_seconds = (datetime.now() - cached_at).total_seconds()
+            if cached_at_epoch:
+                age_seconds = time.time() - cached_at_epoch
 
                 # 如果缓存超过10分钟，返回None让调用者决定如何处理
                 if age_seconds > 600:
                     return None
 
-            return cache_data.get("balance_data")
+            return dict(balance_data) if balance_data else balance_data
 
         except Exception:
             return None
@@ -59,12 +129,21 @@ class BackgroundTaskIntegration:
         return self.daemon_manager.get_daemon_status(platform)
 
     def is_background_task_healthy(self, platform: str) -> bool:
-        """检查后台任务是否健康运行"""
+        """检查后台任务是否健康运行（1秒内重复调用直接返回上次结果）"""
+        now = time.monotonic()
+        checked_at, healthy = self._health_ttl.get(platform, (None, False))
+        if checked_at is not None and now - checked_at < 1.0:
+            return healthy
+
         status = self.get_background_task_status(platform)
-        return status.get("running", False)
+        healthy = status.get("running", False)
+        self._health_ttl[platform] = (now, healthy)
+        return healthy
 
     def restart_background_task(self, platform: str, config: Dict[str, Any]) -> bool:
         """重启后台任务"""
+        self._health_ttl.pop(platform, None)
+
         # 先停止
         self.daemon_manager.stop_daemon(platform)
         time.sleep(2)
@@ -9,21 +9,79 @@ import sys
 import json
 import time
 import signal
+import select
 import argparse
 import threading
-from typing import Dict, Any, Optional, List, Callable
+import functools
+import importlib
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
+import queue
 import logging
+import logging.handlers
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps_compact(data: Any) -> bytes:
+    """紧凑序列化为UTF-8字节（优先使用orjson）"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+# 任务错误信息在状态文件中保留的最大长度
+MAX_ERROR_LENGTH = 200
+
+# 无状态变化时写入状态文件的心跳间隔（秒）
+STATUS_HEARTBEAT_INTERVAL = 300
+
+# 平台名称 -> (模块路径, 平台类名)，按需导入
+_PLATFORM_LOADERS = {
+    "gaccode": ("platforms.gaccode", "GACCodePlatform"),
+    "kimi": ("platforms.kimi", "KimiPlatform"),
+    "deepseek": ("platforms.deepseek", "DeepSeekPlatform"),
+    "siliconflow": ("platforms.siliconflow", "SiliconFlowPlatform"),
+}
+
+# 模块加载时将项目根目录加入sys.path，供按需导入平台模块
+_SCRIPT_DIR = str(Path(__file__).resolve().parent.parent)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_platform_class(name: str) -> Optional[type]:
+    """导入并缓存平台类，不支持的平台返回None"""
+    loader = _PLATFORM_LOADERS.get(name)
+    if not loader:
+        return None
+
+    module_name, class_name = loader
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class TaskExecutor:
     """后台任务执行器守护进程"""
 
-    def __init__(self, platform: str, data_dir: Path, config: Dict[str, Any]):
+    def __init__(
+        self,
+        platform: str,
+        data_dir: Path,
+        config: Dict[str, Any],
+        verify_token: Optional[str] = None,
+    ):
         self.platform = platform
         self.data_dir = data_dir
         self.config = config
+        self.verify_token = verify_token
         self.running = False
         self.shutdown_event = threading.Event()
 
@@ -46,30 +104,91 @@ class TaskExecutor:
         self.task_configs = {}
         self.platform_task_config = None
 
+        # 平台实例创建后预先绑定的任务方法：任务名 -> 方法
+        self._task_methods: Dict[str, Callable[..., Any]] = {}
+
         # 任务统计 - 动态初始化，支持所有平台的不同任务配置
         self.task_stats = {}
 
+        # 各任务上次运行的单调时钟时间（进程内部状态，不写入状态文件）
+        self._last_run_monotonic: Dict[str, float] = {}
+
+        # 内置任务处理器，未列出的任务交由平台实例动态调度
+        self._task_handlers: Dict[str, Callable[[], None]] = {
+            "balance_check": self._task_balance_check,
+            "refill_check": self._task_refill_check,
+            "cache_cleanup": self._task_cache_cleanup,
+            "multiplier_update": self._task_multiplier_update,
+        }
+
+        # 上次写入状态文件的内容（不含last_activity），用于跳过无变化的写入
+        self._last_status_bytes: Optional[bytes] = None
+
+        # 余额缓存文件解析结果：(mtime_ns, 缓存内容)，文件未变化时复用
+        self._balance_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+        # 状态是否有待写入的变化，以及上次写入时间（单调时钟）
+        self._status_dirty = True
+        self._last_status_write_monotonic = 0.0
+
         # 注册信号处理
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
         if hasattr(signal, "SIGHUP"):
             signal.signal(signal.SIGHUP, self._signal_handler)
 
+        # 信号唤醒管道：信号到达时内核向管道写入字节，直接唤醒主循环的select
+        # （Windows的select不支持管道，继续使用Event.wait）
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        if os.name != "nt":
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+            signal.set_wakeup_fd(self._wake_w)
+
+        # 启动器在spawn时屏蔽了SIGINT/SIGTERM，处理器就绪后解除屏蔽，
+        # 期间到达的信号会在此时投递
+        if hasattr(signal, "pthread_sigmask"):
+            signal.pthread_sigmask(
+                signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM}
+            )
+
     def _setup_logging(self):
-        """设置日志记录"""
+        """设置日志记录（由后台线程批量写入，主循环不阻塞在磁盘I/O上）"""
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.log_file,
+            maxBytes=5 * 1024 * 1024,
+            backupCount=3,
+            encoding="utf-8",
+            delay=True,
+        )
+        handlers = [file_handler]
+        # 后台启动时stdout/stderr已重定向到同一个日志文件，再输出到stdout会重复写入，
+        # 并在轮转后继续追加到已被重命名/删除的旧文件；仅在前台终端运行时输出到控制台
+        if sys.stdout is not None and sys.stdout.isatty():
+            handlers.append(logging.StreamHandler(sys.stdout))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+
         logging.basicConfig(
             level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] %(message)s",
-            handlers=[
-                logging.FileHandler(self.log_file, encoding="utf-8"),
-                logging.StreamHandler(sys.stdout),
-            ],
+            handlers=[logging.handlers.QueueHandler(log_queue)],
         )
         self.logger = logging.getLogger(f"daemon-{self.platform}")
 
     def _signal_handler(self, signum, frame):
         """信号处理器"""
         self.logger.info(f"Received signal {signum}, initiating shutdown...")
+        self._status_dirty = True
         self.shutdown()
 
     def start(self):
@@ -90,12 +209,19 @@ class TaskExecutor:
             self.running = False
             self._update_status("stopped")
             self.logger.info("Daemon stopped")
+            # 停止日志线程，写出队列中剩余的记录
+            self._log_listener.stop()
 
     def shutdown(self):
         """优雅关闭"""
         self.logger.info("Initiating graceful shutdown...")
         self.shutdown_event.set()
         self.running = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass  # 管道已满，主循环已会被唤醒
 
     def _main_loop(self):
         """主执行循环"""
@@ -104,16 +230,17 @@ class TaskExecutor:
 
         while self.running and not self.shutdown_event.is_set():
             try:
+                # 每轮只获取一次时间戳，供本轮所有记录共用
+                now_iso = datetime.now().isoformat()
+
                 # 检查并执行到期的任务
-                self._check_and_run_tasks()
+                self._check_and_run_tasks(now_iso)
 
-                # 更新状态
-                self._update_status("running")
+                # 仅在状态变化或心跳到期时写入状态文件
+                self._maybe_flush_status(now_iso)
 
-                # 短暂休眠，避免CPU占用过高
-                if not self.shutdown_event.wait(30):  # 30秒间隔
-                    continue
-                else:
+                # 短暂休眠，避免CPU占用过高（30秒间隔，信号或关闭请求会立即唤醒）
+                if self._wait_for_wakeup(30):
                     break
 
             except KeyboardInterrupt:
@@ -123,10 +250,21 @@ class TaskExecutor:
                 self.logger.error(f"Error in main loop: {e}")
                 time.sleep(60)  # 出错时等待更长时间
 
-    def _check_and_run_tasks(self):
+    def _wait_for_wakeup(self, timeout: float) -> bool:
+        """休眠至多timeout秒，返回是否已请求关闭"""
+        if self._wake_r is None:
+            return self.shutdown_event.wait(timeout)
+
+        readable, _, _ = select.select([self._wake_r], [], [], timeout)
+        if readable:
+            try:
+                os.read(self._wake_r, 4096)
+            except BlockingIOError:
+                pass
+        return self.shutdown_event.is_set()
+
+    def _check_and_run_tasks(self, now_iso: str):
         """检查并运行到期的任务"""
-        current_time = datetime.now()
-        
         # 首次运行时初始化平台任务配置
         if not self.task_configs:
             platform_instance = self._get_platform_instance()
@@ -138,21 +276,21 @@ class TaskExecutor:
             if not task_config.get("enabled", True):
                 continue
 
-            # 检查是否到了执行时间
-            last_run = task_config["last_run"]
-            if last_run is None:
-                should_run = True
-            else:
-                last_run_time = datetime.fromisoformat(last_run)
-                should_run = (
-                    current_time - last_run_time
-                ).total_seconds() >= task_config["interval"]
+            # 检查是否到了执行时间（使用单调时钟，不受系统时间调整影响）
+            now_monotonic = time.monotonic()
+            last_run_monotonic = self._last_run_monotonic.get(task_name)
+            should_run = (
+                last_run_monotonic is None
+                or now_monotonic - last_run_monotonic >= task_config["interval"]
+            )
 
             if should_run:
-                self._run_task(task_name)
-                task_config["last_run"] = current_time.isoformat()
+                self._run_task(task_name, now_iso)
+                self._last_run_monotonic[task_name] = now_monotonic
+                # ISO时间字符串仅用于状态文件展示
+                task_config["last_run"] = now_iso
 
-    def _run_task(self, task_name: str):
+    def _run_task(self, task_name: str, now_iso: str):
         """执行指定任务"""
         self.logger.info(f"Running task: {task_name}")
 
@@ -167,30 +305,26 @@ class TaskExecutor:
                 }
             
             self.task_stats[task_name]["runs"] += 1
+            self._status_dirty = True
 
             # 根据任务类型调用相应的处理方法
-            if task_name == "balance_check":
-                self._task_balance_check()
-            elif task_name == "refill_check":
-                self._task_refill_check()
-            elif task_name == "cache_cleanup":
-                self._task_cache_cleanup()
-            elif task_name == "multiplier_update":
-                self._task_multiplier_update()
+            handler = self._task_handlers.get(task_name)
+            if handler:
+                handler()
             else:
                 # 尝试动态任务调度
                 self._run_dynamic_task(task_name)
 
             # 记录成功
-            self.task_stats[task_name]["last_success"] = datetime.now().isoformat()
+            self.task_stats[task_name]["last_success"] = now_iso
             self.logger.info(f"Task {task_name} completed successfully")
 
         except Exception as e:
             # 记录错误
             self.task_stats[task_name]["errors"] += 1
             self.task_stats[task_name]["last_error"] = {
-                "time": datetime.now().isoformat(),
-                "error": str(e),
+                "time": now_iso,
+                "error": str(e)[:MAX_ERROR_LENGTH],
             }
             self.logger.error(f"Task {task_name} failed: {e}")
 
@@ -201,8 +335,7 @@ class TaskExecutor:
             raise Exception("Failed to create platform instance")
 
         # 调用平台标准方法
-        method_name = self.platform_task_config['balance_check']['method']
-        method = getattr(platform_instance, method_name)
+        method = self._task_methods["balance_check"]
         balance_data = method()
 
         if balance_data:
@@ -211,11 +344,15 @@ class TaskExecutor:
             cache_data = {
                 "balance_data": balance_data,
                 "cached_at": datetime.now().isoformat(),
+                "cached_at_epoch": time.time(),
                 "source": "background_task",
             }
 
-            with open(task_cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # 紧凑JSON一次写入（读取方均为程序解析，无需缩进）
+            task_cache_file.write_bytes(_dumps_compact(cache_data))
+
+            # 刚写入的数据直接放入内存缓存，refill检查无需再读文件
+            self._balance_cache = (os.stat(task_cache_file).st_mtime_ns, cache_data)
 
             self.logger.info(
                 f"Balance check completed, balance: {balance_data.get('balance', 'unknown')}"
@@ -230,15 +367,12 @@ class TaskExecutor:
             self.logger.debug("Refill check disabled for this platform")
             return
             
-        # 读取最新的余额数据
-        task_cache_file = self.task_dir / f"{self.platform}_balance_task.json"
-        if not task_cache_file.exists():
-            self.logger.info("No balance data available, skipping refill check")
-            return
-
         try:
-            with open(task_cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+            # 读取最新的余额数据
+            cache_data = self._get_balance_cache()
+            if cache_data is None:
+                self.logger.info("No balance data available, skipping refill check")
+                return
 
             balance_data = cache_data.get("balance_data")
             if not balance_data:
@@ -251,8 +385,7 @@ class TaskExecutor:
             # 使用平台标准接口执行refill检查
             platform_instance = self._get_platform_instance()
             if platform_instance:
-                method_name = self.platform_task_config['refill_check']['method']
-                method = getattr(platform_instance, method_name)
+                method = self._task_methods["refill_check"]
                 method(balance_data)  # 传递余额数据给平台方法
                 self.logger.info("Refill check delegated to platform")
             else:
@@ -261,6 +394,23 @@ class TaskExecutor:
         except Exception as e:
             self.logger.error(f"Error in refill check: {e}")
 
+    def _get_balance_cache(self) -> Optional[Dict[str, Any]]:
+        """获取余额缓存内容，文件mtime未变化时直接返回内存中的解析结果"""
+        task_cache_file = self.task_dir / f"{self.platform}_balance_task.json"
+        try:
+            mtime_ns = os.stat(task_cache_file).st_mtime_ns
+        except FileNotFoundError:
+            self._balance_cache = None
+            return None
+
+        if self._balance_cache and self._balance_cache[0] == mtime_ns:
+            return self._balance_cache[1]
+
+        data = task_cache_file.read_bytes()
+        cache_data = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+        self._balance_cache = (mtime_ns, cache_data)
+        return cache_data
+
     def _task_cache_cleanup(self):
         """缓存清理任务（使用平台标准接口 + 默认清理）"""
         cleanup_count = 0
@@ -269,33 +419,28 @@ class TaskExecutor:
         try:
             platform_instance = self._get_platform_instance()
             if platform_instance:
-                method_name = self.platform_task_config['cache_cleanup']['method']
-                method = getattr(platform_instance, method_name)
+                method = self._task_methods["cache_cleanup"]
                 method()  # 调用平台特定清理
                 self.logger.debug("Platform-specific cache cleanup completed")
         except Exception as e:
             self.logger.warning(f"Platform cache cleanup failed: {e}")
 
-        # 2. 默认的任务缓存清理
-        for cache_file in self.task_dir.glob(f"{self.platform}_*.json"):
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    cache_data = json.load(f)
-
-                cached_at_str = cache_data.get("cached_at")
-                if cached_at_str:
-                    cached_at = datetime.fromisoformat(cached_at_str)
-                    age_hours = (datetime.now() - cached_at).total_seconds() / 3600
-
+        # 2. 默认的任务缓存清理（缓存文件写入时即更新mtime，无需解析JSON）
+        prefix = f"{self.platform}_"
+        now = time.time()
+        with os.scandir(self.task_dir) as it:
+            for entry in it:
+                if not entry.name.startswith(prefix) or not entry.name.endswith(
+                    ".json"
+                ):
+                    continue
+                try:
                     # 清理超过24小时的缓存
-                    if age_hours > 24:
-                        cache_file.unlink()
+                    if now - entry.stat().st_mtime > 86400:
+                        os.unlink(entry.path)
                         cleanup_count += 1
-
-            except Exception:
-                # 损坏的缓存文件直接删除
-                cache_file.unlink()
-                cleanup_count += 1
+                except OSError:
+                    pass  # 文件已被删除或无法访问
 
         if cleanup_count > 0:
             self.logger.info(f"Cleaned up {cleanup_count} expired cache files")
@@ -303,28 +448,11 @@ class TaskExecutor:
     def _import_platform_module(self):
         """动态导入平台模块"""
         try:
-            # 添加项目根目录到path
-            script_dir = Path(__file__).parent.parent
-            
-            if str(script_dir) not in sys.path:
-                sys.path.insert(0, str(script_dir))
-
-            # 根据平台名称导入对应模块
-            if self.platform == "gaccode":
-                from platforms.gaccode import GACCodePlatform
-                return GACCodePlatform
-            elif self.platform == "kimi":
-                from platforms.kimi import KimiPlatform
-                return KimiPlatform
-            elif self.platform == "deepseek":
-                from platforms.deepseek import DeepSeekPlatform
-                return DeepSeekPlatform
-            elif self.platform == "siliconflow":
-                from platforms.siliconflow import SiliconFlowPlatform
-                return SiliconFlowPlatform
-            else:
+            # 根据平台名称导入对应模块（结果缓存）
+            platform_class = _load_platform_class(self.platform)
+            if platform_class is None:
                 self.logger.error(f"Unsupported platform: {self.platform}")
-                return None
+            return platform_class
 
         except ImportError as e:
             self.logger.error(f"Failed to import platform module: {e}")
@@ -358,9 +486,16 @@ class TaskExecutor:
                 for task_name, task_config in base_config.items():
                     self.task_configs[task_name] = {
                         **task_config,
-                        "last_run": None
+                        "last_run": None,
                     }
                 self.platform_task_config = base_config
+
+                # 预先解析各任务对应的平台方法，避免每次执行时重复查找
+                self._task_methods = {}
+                for task_name, task_config in base_config.items():
+                    method = getattr(instance, task_config["method"], None)
+                    if method:
+                        self._task_methods[task_name] = method
             
             # 缓存实例
             self._platform_instance = instance
@@ -394,20 +529,35 @@ class TaskExecutor:
             raise Exception("Failed to create platform instance for dynamic task")
         
         method_name = self.platform_task_config[task_name]['method']
-        if hasattr(platform_instance, method_name):
-            method = getattr(platform_instance, method_name)
+        method = self._task_methods.get(task_name)
+        if method:
             result = method()
             self.logger.info(f"Dynamic task {task_name} completed via {method_name}")
         else:
             self.logger.error(f"Platform method {method_name} not found for task {task_name}")
 
-    def _update_status(self, status: str, extra_data: Optional[Dict[str, Any]] = None):
-        """更新守护进程状态"""
+    def _maybe_flush_status(self, now_iso: Optional[str] = None):
+        """状态有变化或超过心跳间隔（5分钟）时才写入运行状态"""
+        heartbeat_due = (
+            time.monotonic() - self._last_status_write_monotonic
+            > STATUS_HEARTBEAT_INTERVAL
+        )
+        if self._status_dirty or heartbeat_due:
+            self._update_status("running", force=heartbeat_due, now_iso=now_iso)
+
+    def _update_status(
+        self,
+        status: str,
+        extra_data: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+        now_iso: Optional[str] = None,
+    ):
+        """更新守护进程状态（force为True时即使内容未变化也写入，用作心跳）"""
         status_data = {
             "platform": self.platform,
             "status": status,
             "pid": os.getpid(),
-            "last_activity": datetime.now().isoformat(),
+            "verify_token": self.verify_token,
             "task_configs": self.task_configs,
             "task_stats": self.task_stats,
         }
@@ -416,8 +566,40 @@ class TaskExecutor:
             status_data.update(extra_data)
 
         try:
-            with open(self.status_file, "w", encoding="utf-8") as f:
-                json.dump(status_data, f, ensure_ascii=False, indent=2)
+            # 完整序列化状态（不含last_activity）并与上次写入的内容比较
+            state_bytes = _dumps_compact(status_data)
+
+            # 状态内容未变化时跳过写入（last_activity只在状态变化时更新）
+            if state_bytes == self._last_status_bytes and not force:
+                self._status_dirty = False
+                return
+
+            # last_activity插在对象开头的"{"之后：该位置与键顺序和序列化格式无关，
+            # 无需再次序列化整个状态
+            last_activity = now_iso or datetime.now().isoformat()
+            payload = (
+                b'{"last_activity":'
+                + _dumps_compact(last_activity)
+                + b","
+                + state_bytes[1:]
+            )
+
+            # 先写临时文件再原子替换，避免读取方看到写了一半的文件
+            tmp_file = self.status_file.with_suffix(".status.tmp")
+            try:
+                with open(tmp_file, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_file, self.status_file)
+            except OSError:
+                # 写入或替换失败时删除临时文件，避免残留
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+                raise
+            self._last_status_bytes = state_bytes
+            self._status_dirty = False
+            self._last_status_write_monotonic = time.monotonic()
         except Exception as e:
             self.logger.error(f"Failed to update status file: {e}")
 
@@ -428,6 +610,7 @@ def main():
     parser.add_argument("--platform", required=True, help="平台名称")
     parser.add_argument("--data-dir", required=True, help="数据目录路径")
     parser.add_argument("--config", required=True, help="平台配置JSON")
+    parser.add_argument("--verify-token", help="守护进程验证令牌")
 
     args = parser.parse_args()
 
@@ -437,7 +620,9 @@ def main():
         data_dir = Path(args.data_dir)
 
         # 创建并启动守护进程
-        executor = TaskExecutor(args.platform, data_dir, config)
+        executor = TaskExecutor(
+            args.platform, data_dir, config, args.verify_token
+        )
         executor.start()
 
     except KeyboardInterrupt:
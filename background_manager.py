@@ -5,17 +5,34 @@
 """
 
 import sys
-import json
 import argparse
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from datetime import datetime
+
+# 共享的JSON解析/序列化（orjson优先、自动去掉UTF-8 BOM）
+from data.file_lock import json_loads, json_dumps
 
 # 导入后台任务模块
-from background.daemon_manager import DaemonManager
+from background.daemon_manager import get_daemon_manager
 from background.platform_integration import BackgroundTaskIntegration
 
 
+def _tail(path: Path, n: int, block: int = 8192) -> List[str]:
+    """从文件末尾按块向前读取，返回最后n行（不读取整个文件）"""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    lines = data.splitlines()[-n:] if n > 0 else []
+    return [line.decode("utf-8", errors="replace") for line in lines]
+
+
 class BackgroundManager:
     """后台任务管理器"""
 
@@ -24,20 +41,31 @@ class BackgroundManager:
             data_dir = Path(__file__).parent / "data"
 
         self.data_dir = data_dir
-        self.daemon_manager = DaemonManager(data_dir)
+        self.daemon_manager = get_daemon_manager(data_dir)
         self.integration = BackgroundTaskIntegration(data_dir)
 
         # 平台配置文件路径
         self.platform_config_file = data_dir / "config" / "config.json"
 
+        # 平台配置解析结果缓存：(mtime_ns, 配置内容)
+        self._cfg_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
     def load_platform_configs(self) -> Dict[str, Any]:
         """加载平台配置"""
-        if not self.platform_config_file.exists():
+        try:
+            mtime_ns = self.platform_config_file.stat().st_mtime_ns
+        except FileNotFoundError:
             return {}
 
+        # 配置文件未变化时直接复用上次的解析结果
+        if self._cfg_cache and self._cfg_cache[0] == mtime_ns:
+            return self._cfg_cache[1]
+
         try:
-            with open(self.platform_config_file, "r", encoding="utf-8-sig") as f:
-                return json.load(f)
+            # 按字节读取，json_loads会去掉可能存在的UTF-8 BOM
+            configs = json_loads(self.platform_config_file.read_bytes())
+            self._cfg_cache = (mtime_ns, configs)
+            return configs
         except Exception as e:
             print(f"Error loading platform config: {e}")
             return {}
@@ -113,10 +141,10 @@ class BackgroundManager:
 
         if balance_cache.exists():
             try:
-                info["balance_cache_size"] = balance_cache.stat().st_size
+                data = balance_cache.read_bytes()
+                info["balance_cache_size"] = len(data)
 
-                with open(balance_cache, "r", encoding="utf-8") as f:
-                    cache_data = json.load(f)
+                cache_data = json_loads(data)
 
                 info["balance_data"] = cache_data.get("balance_data")
                 info["cached_at"] = cache_data.get("cached_at")
@@ -135,12 +163,8 @@ class BackgroundManager:
             return
 
         try:
-            with open(log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # 显示最后N行
-            if len(lines) > tail_lines:
-                lines = lines[-tail_lines:]
+            # 只读取文件末尾的最后N行
+            lines = _tail(log_file, tail_lines)
 
             print(f"=== Last {len(lines)} lines of {platform} daemon log ===")
             for line in lines:
@@ -156,29 +180,27 @@ def format_status_table(daemons: List[Dict[str, Any]]) -> None:
         print("No daemons found.")
         return
 
+    row_fmt = "{:<12} {:<10} {:<8} {:<20} {:<15}"
+
     # 表格头
-    print(f"{'Platform':<12} {'Status':<10} {'PID':<8} {'Started':<20} {'Tasks':<15}")
+    print(row_fmt.format("Platform", "Status", "PID", "Started", "Tasks"))
     print("-" * 70)
 
     for daemon in daemons:
         platform = daemon.get("platform", "unknown")
         status = "Running" if daemon.get("running") else "Stopped"
         pid = str(daemon.get("pid", "N/A"))
-        started = daemon.get("started_at", "N/A")
+        started = daemon.get("started_at") or "N/A"
 
-        # 格式化启动时间
-        if started != "N/A":
-            try:
-                dt = datetime.fromisoformat(started)
-                started = dt.strftime("%m-%d %H:%M:%S")
-            except:
-                pass
+        # 格式化启动时间：直接截取ISO时间字符串（YYYY-MM-DDTHH:MM:SS...）
+        if len(started) >= 19 and started[4] == "-" and started[10] == "T":
+            started = started[5:10] + " " + started[11:19]
 
         # 任务统计
         task_stats = daemon.get("task_stats", {})
         task_summary = f"{len(task_stats)} tasks"
 
-        print(f"{platform:<12} {status:<10} {pid:<8} {started:<20} {task_summary:<15}")
+        print(row_fmt.format(platform, status, pid, started, task_summary))
 
 
 def main():
@@ -254,7 +276,7 @@ def main():
         elif args.command == "status":
             if args.platform:
                 status = manager.get_platform_status(args.platform)
-                print(json.dumps(status, indent=2, ensure_ascii=False))
+                print(json_dumps(status).decode("utf-8"))
             else:
                 daemons = manager.list_all_daemons()
                 format_status_table(daemons)
@@ -276,7 +298,7 @@ def main():
 
         elif args.command == "cache":
             cache_info = manager.get_task_cache_info(args.platform)
-            print(json.dumps(cache_info, indent=2, ensure_ascii=False))
+            print(json_dumps(cache_info).decode("utf-8"))
             return 0
 
         elif args.command == "platforms":
@@ -17,26 +17,26 @@ Multi-Platform Claude Code Launcher
 import sys
 import os
 import json
+import time
 import shutil
 import subprocess
-import argparse
-import uuid
 import re
+import functools
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 
 # Add data directory to path for imports
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir.parent / "data"))
 
-try:
-    from logger import log_message
+sys.path.insert(0, str(script_dir.parent))
 
-    sys.path.insert(0, str(script_dir.parent))
-    from config import get_config_manager
-    from session import get_session_manager
-except ImportError as e:
+
+def _exit_on_import_error(e: ImportError) -> None:
+    """必需模块无法导入时提示并退出"""
     print(f"Failed to import required modules: {e}")
     print(
         "Please ensure unified modules (config.py, session.py, cache.py) are available"
@@ -44,20 +44,236 @@ except ImportError as e:
     sys.exit(1)
 
 
+# config/session/logger模块较重，推迟到首次使用时导入（--help等路径无需加载）
+try:
+    from data.file_lock import safe_json_read, safe_json_write
+except ImportError as e:
+    _exit_on_import_error(e)
+
+# SessionMappingV2（可选，不可用时跳过会话映射）
+try:
+    from data.session_mapping_v2 import (
+        get_session_platform as _get_session_platform,
+        set_session_platform as _set_session_platform,
+    )
+except ImportError:
+    _get_session_platform = None
+    _set_session_platform = None
+
+
+def _mask_sk(m: "re.Match") -> str:
+    """屏蔽sk密钥，只保留末尾4位"""
+    return f"sk-***{m.group()[-4:]}"
+
+
+def _mask_bearer(m: "re.Match") -> str:
+    """屏蔽Bearer令牌，只保留末尾4位"""
+    return f"Bearer ***{m.group().split()[-1][-4:]}"
+
+
+def _mask_jwt(m: "re.Match") -> str:
+    """屏蔽JWT，只保留末尾4位"""
+    return f"jwt-***{m.group()[-4:]}"
+
+
+# 日志脱敏规则（模块加载时编译一次），按顺序逐条替换：
+# 前一条规则的输出会被后续规则再次扫描，粘连在一起的密钥/令牌都能被屏蔽
+_SENSITIVE_PATTERNS = (
+    (re.compile(r"sk-[a-zA-Z0-9\-]{30,100}"), _mask_sk),
+    (re.compile(r"Bearer [a-zA-Z0-9+/=]{20,}"), _mask_bearer),
+    (re.compile(r"eyJ[a-zA-Z0-9+/=]{20,}"), _mask_jwt),
+)
+
+# 敏感字段名（不区分大小写的子串匹配），合并为单个正则
+_SENSITIVE_KEY_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "api_key",
+                "auth_token",
+                "login_token",
+                "password",
+                "secret",
+                "private_key",
+                "access_token",
+                "refresh_token",
+            ),
+        )
+    ),
+    re.IGNORECASE,
+)
+
+# 用户主目录及Claude Code用户配置文件（模块加载时解析一次）
+_HOME = Path.home()
+_CLAUDE_SETTINGS_FILE = _HOME / ".claude" / "settings.json"
+_CLAUDE_SETTINGS_BACKUP = _HOME / ".claude" / "settings.json.backup"
+
+# 非ASCII字符（控制台编码不支持时移除）
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7F]+")
+
+
+# 启动前需要清理的环境变量
+_VARS_TO_CLEAR = frozenset(
+    {
+        # Claude Code 核心环境变量
+        "ANTHROPIC_API_KEY",
+        "ANTHROPIC_AUTH_TOKEN",
+        "ANTHROPIC_BASE_URL",
+        "ANTHROPIC_API_URL",
+        "ANTHROPIC_API_VERSION",
+        "ANTHROPIC_CUSTOM_HEADERS",
+        "ANTHROPIC_DEFAULT_HEADERS",
+        "ANTHROPIC_MODEL",
+        "ANTHROPIC_SMALL_FAST_MODEL",
+        "ANTHROPIC_SMALL_FAST_MODEL_AWS_REGION",
+        "ANTHROPIC_TIMEOUT_MS",
+        "ANTHROPIC_REQUEST_TIMEOUT",
+        "ANTHROPIC_MAX_RETRIES",
+        # Claude Code 默认模型环境变量
+        "ANTHROPIC_DEFAULT_HAIKU_MODEL",
+        "ANTHROPIC_DEFAULT_OPUS_MODEL",
+        "ANTHROPIC_DEFAULT_SONNET_MODEL",
+        # Claude Code 配置变量 (根据错误信息确认支持的)
+        "CLAUDE_CODE_MAX_OUTPUT_TOKENS",
+        # 代理相关变量
+        "HTTPS_PROXY",
+        "HTTP_PROXY",
+        # 其他AI平台环境变量
+        "MOONSHOT_API_KEY",
+        "DEEPSEEK_API_KEY",
+        "SILICONFLOW_API_KEY",
+        # 可能的其他相关变量
+        "CLAUDE_API_KEY",
+        "CLAUDE_AUTH_TOKEN",
+        "CLAUDE_BASE_URL",
+        "CLAUDE_MODEL",
+    }
+)
+
+
+# 环境变量指向的Git安装（环境变量名, 相对路径）
+_GIT_BASH_ENV_VARS = (
+    ("GIT_INSTALL_PATH", "Git/bin/bash.exe"),
+    ("PROGRAMFILES", "Git/bin/bash.exe"),
+    ("PROGRAMFILES(X86)", "Git/bin/bash.exe"),
+    ("LOCALAPPDATA", "Programs/Git/bin/bash.exe"),
+)
+
+
+def _iter_git_bash_candidates() -> Iterator[Path]:
+    """按优先级逐个生成Git Bash候选路径（Windows），调用方找到即停止"""
+    # 1. 检查环境变量指向的Git安装
+    for env_var, relative_path in _GIT_BASH_ENV_VARS:
+        value = os.environ.get(env_var)
+        if value:
+            yield Path(value) / relative_path
+
+    # 2. Scoop安装路径 (用户目录下)
+    yield _HOME / "scoop" / "apps" / "git" / "current" / "bin" / "bash.exe"
+
+    # 3. 常见安装位置 (作为fallback)
+    yield Path("C:/Program Files/Git/bin/bash.exe")
+    yield Path("C:/Program Files (x86)/Git/bin/bash.exe")
+
+    # 4. 用户自定义安装路径
+    yield _HOME / "AppData" / "Local" / "Programs" / "Git" / "bin" / "bash.exe"
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_standard_uuid(prefixed_session_id: str) -> Optional[str]:
+    """从2位平台ID前缀的session_id中提取标准UUID，无法识别时返回None"""
+    # 检查是否为带前缀的UUID（36位长度且第3位是'-'）
+    if len(prefixed_session_id) == 36 and prefixed_session_id[2] == "-":
+        # 移除前2位平台前缀，保留剩余部分作为标准UUID
+        return prefixed_session_id[2:]
+
+    # 如果已经是标准UUID格式（没有平台前缀），直接返回
+    if len(prefixed_session_id) == 36 and prefixed_session_id[2] != "-":
+        return prefixed_session_id
+
+    return None
+
+
+def _path_key() -> str:
+    """当前PATH的短哈希，用于判断命令查找结果是否可能变化"""
+    return hashlib.blake2b(
+        os.environ.get("PATH", "").encode("utf-8", "surrogateescape"), digest_size=8
+    ).hexdigest()
+
+
+def _needs_shell(exe_path: str) -> bool:
+    """Windows批处理脚本（.cmd/.bat）需要通过cmd.exe执行"""
+    return exe_path.lower().endswith((".cmd", ".bat"))
+
+
+def _unwrap_npm_claude_shim(exe_path: str) -> Optional[List[str]]:
+    """npm在Windows上生成的claude.cmd只是用node运行cli.js，返回[node, cli.js]以绕过cmd.exe"""
+    shim = Path(exe_path)
+    if shim.stem.lower() != "claude" or not _needs_shell(exe_path):
+        return None
+
+    cli_js = shim.parent / "node_modules" / "@anthropic-ai" / "claude-code" / "cli.js"
+    if not cli_js.is_file():
+        return None
+
+    # 与npm shim的查找顺序一致：优先使用同目录下的node.exe
+    local_node = shim.parent / "node.exe"
+    node = str(local_node) if local_node.is_file() else shutil.which("node")
+    return [node, str(cli_js)] if node else None
+
+
+class _ProbeGroup:
+    """并发探测启动的子进程集合，选出结果后终止其余仍在运行的探测进程"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._procs: List[subprocess.Popen] = []
+        self._closed = False
+
+    def spawn(self, args: List[str], **kwargs) -> Optional[subprocess.Popen]:
+        """启动并登记探测进程，探测已结束时不再启动（返回None）"""
+        with self._lock:
+            if self._closed:
+                return None
+            proc = subprocess.Popen(args, **kwargs)
+            self._procs.append(proc)
+            return proc
+
+    def kill_all(self) -> None:
+        """终止并回收仍在运行的探测进程（避免exec交接后成为孤儿进程）"""
+        with self._lock:
+            self._closed = True
+            procs = list(self._procs)
+        for proc in procs:
+            if proc.poll() is None:
+                try:
+                    proc.kill()
+                    proc.wait(timeout=1)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+
+
 class SimpleLogger:
     """简化的日志提供者"""
 
     def __init__(self):
-        pass
+        # 统一日志函数（首次记录时导入logger模块）
+        self._log_message = None
 
     def log(self, level: str, message: str, extra_data: Dict[str, Any] = None) -> None:
         # 屏蔽敏感信息
         safe_message = self._mask_sensitive_data(message)
-        safe_extra_data = self._mask_sensitive_dict(extra_data or {})
+        # 大多数调用不带附加数据，跳过字典遍历
+        safe_extra_data = self._mask_sensitive_dict(extra_data) if extra_data else {}
 
         # 使用统一日志系统
         try:
-            log_message("launcher", level, safe_message, safe_extra_data)
+            if self._log_message is None:
+                from logger import log_message
+
+                self._log_message = log_message
+            self._log_message("launcher", level, safe_message, safe_extra_data)
         except:
             pass  # 如果日志系统不可用，继续执行
 
@@ -69,18 +285,20 @@ class SimpleLogger:
             "DEBUG": Colors.GRAY,
         }.get(level, Colors.NC)
 
-        print(Colors.colorize(safe_message, color))
+        try:
+            print(Colors.colorize(safe_message, color))
+        except UnicodeEncodeError:
+            print(Colors.colorize(_strip_non_ascii(safe_message), color))
 
     def _mask_sensitive_data(self, text: str) -> str:
         """屏蔽文本中的敏感信息"""
-        patterns = [
-            (r"sk-[a-zA-Z0-9\-]{30,100}", lambda m: f"sk-***{m.group()[-4:]}"),
-            (r"Bearer [a-zA-Z0-9+/=]{20,}", lambda m: f"Bearer ***{m.group().split()[-1][-4:]}"),
-            (r"eyJ[a-zA-Z0-9+/=]{20,}", lambda m: f"jwt-***{m.group()[-4:]}"),
-        ]
+        # 大多数日志不含任何规则的字面前缀，三次子串查找后直接返回
+        if not ("sk-" in text or "Bearer " in text or "eyJ" in text):
+            return text
+
         result = text
-        for pattern, replacement in patterns:
-            result = re.sub(pattern, replacement, result)
+        for pattern, replacement in _SENSITIVE_PATTERNS:
+            result = pattern.sub(replacement, result)
         return result
 
     def _mask_sensitive_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -88,28 +306,28 @@ class SimpleLogger:
         if not isinstance(data, dict):
             return data
 
-        sensitive_keys = {
-            "api_key",
-            "auth_token",
-            "login_token",
-            "password",
-            "secret",
-            "private_key",
-            "access_token",
-            "refresh_token",
-        }
+        # 快速路径：扁平且不含敏感键的字典无需复制，直接返回原字典
+        if not any(isinstance(value, dict) for value in data.values()) and not any(
+            _SENSITIVE_KEY_RE.search(key) for key in data
+        ):
+            return data
 
         masked = {}
-        for key, value in data.items():
-            if any(sensitive in key.lower() for sensitive in sensitive_keys):
-                if isinstance(value, str) and len(value) > 4:
-                    masked[key] = f"***{value[-4:]}"
+        # 使用显式栈处理嵌套字典：(源字典, 目标字典)
+        stack = [(data, masked)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if _SENSITIVE_KEY_RE.search(key):
+                    if isinstance(value, str) and len(value) > 4:
+                        target[key] = f"***{value[-4:]}"
+                    else:
+                        target[key] = "***"
+                elif isinstance(value, dict):
+                    target[key] = {}
+                    stack.append((value, target[key]))
                 else:
-                    masked[key] = "***"
-            elif isinstance(value, dict):
-                masked[key] = self._mask_sensitive_dict(value)
-            else:
-                masked[key] = value
+                    target[key] = value
         return masked
 
 
@@ -124,21 +342,30 @@ class Colors:
     GRAY = "\033[0;37m"
     NC = "\033[0m"  # No Color
 
+    # 输出到终端时才着色（模块加载时检测一次）；Windows Terminal/PowerShell 7+ 支持ANSI
+    ENABLED = sys.stdout.isatty()
+
     @staticmethod
     def colorize(text: str, color: str) -> str:
         """在支持ANSI的终端中着色文本"""
-        # Windows兼容性：避免emoji编码问题
-        try:
-            if os.name == "nt":  # Windows
-                # Windows Terminal/PowerShell 7+ 支持ANSI
-                return f"{color}{text}{Colors.NC}"
-            return f"{color}{text}{Colors.NC}"
-        except UnicodeEncodeError:
-            # 移除emoji字符
-            import re
+        if not Colors.ENABLED:
+            return text
+        return color + text + Colors.NC
+
+    @staticmethod
+    def yellow(text: str) -> str:
+        """黄色文本（颜色固定的调用处使用）"""
+        return Colors.YELLOW + text + Colors.NC if Colors.ENABLED else text
 
-            clean_text = re.sub(r"[^\x00-\x7F]+", "", text)  # 移除非ASCII字符
-            return f"{color}{clean_text}{Colors.NC}"
+    @staticmethod
+    def gray(text: str) -> str:
+        """灰色文本（颜色固定的调用处使用）"""
+        return Colors.GRAY + text + Colors.NC if Colors.ENABLED else text
+
+
+def _strip_non_ascii(text: str) -> str:
+    """移除非ASCII字符（控制台编码无法输出emoji等字符时使用）"""
+    return _NON_ASCII_RE.sub("", text)
 
 
 class ClaudeLauncher:
@@ -146,41 +373,97 @@ class ClaudeLauncher:
 
     def __init__(self):
         self.script_dir = Path(__file__).parent
-        # 使用统一管理器
-        self.config_manager = get_config_manager()
-        self.session_manager = get_session_manager()
+        # Claude Code启动命令探测结果缓存
+        self.claude_cmd_cache_file = (
+            self.script_dir.parent / "data" / "cache" / "claude-cmd.json"
+        )
+        # Git Bash路径探测结果缓存
+        self.git_bash_cache_file = (
+            self.script_dir.parent / "data" / "cache" / "git-bash-path.json"
+        )
+        # 解析出的Claude可执行文件绝对路径（探测与启动共用）
+        self._claude_exe: Optional[str] = None
+        # 无法识别的session_id -> 已生成的替代标准UUID（同一ID只生成并警告一次）
+        self._fallback_uuids: Dict[str, str] = {}
+        # 启用平台缓存：(platforms字典, 启用的平台)，配置未重新加载时复用
+        self._enabled_platforms_cache: Optional[
+            Tuple[Dict[str, Any], Dict[str, Any]]
+        ] = None
+        # 统一管理器（首次访问时才导入对应模块）
+        self._config_manager = None
+        self._session_manager = None
 
         # 使用简化的日志提供者
         self.logger = SimpleLogger()
 
+        # 控制台输出缓冲：每个步骤结束时一次性写出
+        self._out: List[str] = []
+
+    @property
+    def config_manager(self):
+        """统一配置管理器（延迟导入config模块）"""
+        if self._config_manager is None:
+            try:
+                from config import get_config_manager
+            except ImportError as e:
+                _exit_on_import_error(e)
+            self._config_manager = get_config_manager()
+        return self._config_manager
+
+    @property
+    def session_manager(self):
+        """统一会话管理器（延迟导入session模块）"""
+        if self._session_manager is None:
+            try:
+                from session import get_session_manager
+            except ImportError as e:
+                _exit_on_import_error(e)
+            self._session_manager = get_session_manager()
+        return self._session_manager
+
     def log(self, level: str, message: str, extra_data: Dict[str, Any] = None):
         """统一日志记录 - 通过注入的logger提供者"""
+        self._flush_output()
         self.logger.log(level, message, extra_data)
 
+    def _emit(self, text: str, color: str) -> None:
+        """缓冲一行控制台输出"""
+        self._out.append(Colors.colorize(text, color))
+
+    def _flush_output(self) -> None:
+        """一次性写出缓冲的控制台输出"""
+        if self._out:
+            output = "\n".join(self._out) + "\n"
+            self._out.clear()
+            try:
+                sys.stdout.write(output)
+            except UnicodeEncodeError:
+                sys.stdout.write(_strip_non_ascii(output))
+            sys.stdout.flush()
+
     def print_header(self):
         """打印启动器头部信息"""
-        print(Colors.colorize("Multi-Platform Claude Launcher v4.0", Colors.MAGENTA))
-        print(Colors.colorize("=" * 40, Colors.GRAY))
-        print()
+        self._emit("Multi-Platform Claude Launcher v4.0", Colors.MAGENTA)
+        self._emit("=" * 40, Colors.GRAY)
+        self._out.append("")
+        self._flush_output()
 
   
-    def load_config(self) -> Dict[str, Any]:
-        """加载配置文件 - 使用统一配置管理器"""
-        config = self.config_manager.load_config()
-        print(Colors.colorize("Using unified configuration system", Colors.GRAY))
+    def load_config(self, config_future: Optional[Future] = None) -> Dict[str, Any]:
+        """加载配置文件 - 使用统一配置管理器（可传入已提交的预加载任务）"""
+        if config_future is not None:
+            config = config_future.result()
+        else:
+            config = self.config_manager.load_config()
+        print(Colors.gray("Using unified configuration system"))
         return config
 
-    def resolve_platform(
-        self, platform: str, config: Dict[str, Any]
-    ) -> tuple[str, Dict[str, Any]]:
-        """解析平台别名并返回平台配置"""
-        platforms = config["platforms"]
-        aliases = config.get("aliases", {})
-
-        # 解析别名
-        resolved_platform = aliases.get(platform, platform)
+    def _get_enabled_platforms(self, platforms: Dict[str, Any]) -> Dict[str, Any]:
+        """筛选启用且配置了凭证的平台（同一份platforms配置只计算一次）"""
+        cache = self._enabled_platforms_cache
+        if cache and cache[0] is platforms:
+            return cache[1]
 
-        # 获取启用的平台
         enabled_platforms = {}
         for name, platform_config in platforms.items():
             is_enabled = platform_config.get("enabled")
@@ -195,6 +478,22 @@ class ClaudeLauncher:
             if is_enabled and (has_credentials or name == "gaccode"):
                 enabled_platforms[name] = platform_config
 
+        self._enabled_platforms_cache = (platforms, enabled_platforms)
+        return enabled_platforms
+
+    def resolve_platform(
+        self, platform: str, config: Dict[str, Any]
+    ) -> tuple[str, Dict[str, Any]]:
+        """解析平台别名并返回平台配置"""
+        platforms = config["platforms"]
+        aliases = config.get("aliases", {})
+
+        # 解析别名
+        resolved_platform = aliases.get(platform, platform)
+
+        # 获取启用的平台
+        enabled_platforms = self._get_enabled_platforms(platforms)
+
         if resolved_platform and resolved_platform in enabled_platforms:
             return resolved_platform, enabled_platforms[resolved_platform]
         elif platform:
@@ -202,7 +501,7 @@ class ClaudeLauncher:
                 "ERROR",
                 f"Platform '{platform}' (resolved: {resolved_platform}) not enabled or not found",
             )
-            print(Colors.colorize("Available platforms:", Colors.YELLOW))
+            print(Colors.yellow("Available platforms:"))
             for name, platform_config in enabled_platforms.items():
                 aliases_list = [k for k, v in aliases.items() if v == name]
                 alias_text = (
@@ -216,20 +515,15 @@ class ClaudeLauncher:
                 default_platform = config["launcher"].get("default_platform")
                 if default_platform and default_platform in enabled_platforms:
                     print(
-                        Colors.colorize(
-                            f"No platform specified, using configured default: {default_platform}",
-                            Colors.YELLOW,
+                        Colors.yellow(
+                            f"No platform specified, using configured default: {default_platform}"
                         )
                     )
                     return default_platform, enabled_platforms[default_platform]
                 else:
                     # 选择第一个启用的平台
                     selected = list(enabled_platforms.keys())[0]
-                    print(
-                        Colors.colorize(
-                            f"No platform specified, using: {selected}", Colors.YELLOW
-                        )
-                    )
+                    print(Colors.yellow(f"No platform specified, using: {selected}"))
                     return selected, enabled_platforms[selected]
             else:
                 self.log(
@@ -239,142 +533,96 @@ class ClaudeLauncher:
                 sys.exit(1)
 
   
-    def setup_environment(self, platform_config: Dict[str, Any]):
-        """为Claude Code设置环境变量"""
-        print(Colors.colorize("\nSetting up Claude Code environment...", Colors.CYAN))
+    def _find_git_bash(self) -> Optional[Path]:
+        """查找Git Bash路径（Windows），缓存的路径仍存在时只需一次stat"""
+        # 非Windows平台无需Git Bash，跳过缓存读取和所有候选路径stat
+        if os.name != "nt":
+            return None
 
-        # 注意：不再依赖settings文件，直接清理和设置环境变量
+        cached_path = safe_json_read(self.git_bash_cache_file).get("path")
+        if cached_path and os.path.isfile(cached_path):
+            return Path(cached_path)
 
-        # 清理环境变量
-        variables_to_clear = [
-            # Claude Code 核心环境变量
-            "ANTHROPIC_API_KEY",
-            "ANTHROPIC_AUTH_TOKEN",
-            "ANTHROPIC_BASE_URL",
-            "ANTHROPIC_API_URL",
-            "ANTHROPIC_API_VERSION",
-            "ANTHROPIC_CUSTOM_HEADERS",
-            "ANTHROPIC_DEFAULT_HEADERS",
-            "ANTHROPIC_MODEL",
-            "ANTHROPIC_SMALL_FAST_MODEL",
-            "ANTHROPIC_SMALL_FAST_MODEL_AWS_REGION",
-            "ANTHROPIC_TIMEOUT_MS",
-            "ANTHROPIC_REQUEST_TIMEOUT",
-            "ANTHROPIC_MAX_RETRIES",
-            # Claude Code 默认模型环境变量
-            "ANTHROPIC_DEFAULT_HAIKU_MODEL",
-            "ANTHROPIC_DEFAULT_OPUS_MODEL",
-            "ANTHROPIC_DEFAULT_SONNET_MODEL",
-            # Claude Code 配置变量 (根据错误信息确认支持的)
-            "CLAUDE_CODE_MAX_OUTPUT_TOKENS",
-            # 代理相关变量
-            "HTTPS_PROXY",
-            "HTTP_PROXY",
-            # 其他AI平台环境变量
-            "MOONSHOT_API_KEY",
-            "DEEPSEEK_API_KEY",
-            "SILICONFLOW_API_KEY",
-            # 可能的其他相关变量
-            "CLAUDE_API_KEY",
-            "CLAUDE_AUTH_TOKEN",
-            "CLAUDE_BASE_URL",
-            "CLAUDE_MODEL",
-        ]
+        git_bash_path = self._search_git_bash()
+        if git_bash_path and str(git_bash_path) != cached_path:
+            safe_json_write(self.git_bash_cache_file, {"path": str(git_bash_path)})
+        return git_bash_path
+
+    def _search_git_bash(self) -> Optional[Path]:
+        """搜索Git Bash路径（仅Windows），优先使用PATH中的Git Bash，其次检查候选路径"""
+        # PATH中的bash可能是WSL的System32\bash.exe，只接受Git自带的bash
+        bash_from_path = shutil.which("bash")
+        if bash_from_path and "git" in bash_from_path.lower():
+            return Path(bash_from_path)
+
+        return next((p for p in _iter_git_bash_candidates() if p.exists()), None)
+
+    def setup_environment(
+        self, platform_config: Dict[str, Any], git_bash_path: Optional[Path] = None
+    ):
+        """为Claude Code设置环境变量（git_bash_path未提供时现场探测）"""
+        self._emit("\nSetting up Claude Code environment...", Colors.CYAN)
+
+        # 注意：不再依赖settings文件，直接清理和设置环境变量
 
-        for var_name in variables_to_clear:
-            if var_name in os.environ:
-                print(Colors.colorize(f"  -> Clearing: {var_name}", Colors.GRAY))
-                del os.environ[var_name]
+        # 清理环境变量（frozenset与环境变量求交集，无命中时直接跳过）
+        for var_name in sorted(_VARS_TO_CLEAR.intersection(os.environ)):
+            del os.environ[var_name]
+            self._emit(f"  -> Clearing: {var_name}", Colors.GRAY)
 
         # 为 Claude Code 设置新环境变量
         # 根据平台配置设置正确的认证变量，确保 api_key 和 auth_token 互斥
 
         # 调试：显示当前环境变量状态
-        print(Colors.colorize(f"  -> Debug: ANTHROPIC_AUTH_TOKEN = {'[SET]' if os.environ.get('ANTHROPIC_AUTH_TOKEN') else '[NOT SET]'}", Colors.CYAN))
-        print(Colors.colorize(f"  -> Debug: ANTHROPIC_API_KEY = {'[SET]' if os.environ.get('ANTHROPIC_API_KEY') else '[NOT SET]'}", Colors.CYAN))
+        self._emit(f"  -> Debug: ANTHROPIC_AUTH_TOKEN = {'[SET]' if os.environ.get('ANTHROPIC_AUTH_TOKEN') else '[NOT SET]'}", Colors.CYAN)
+        self._emit(f"  -> Debug: ANTHROPIC_API_KEY = {'[SET]' if os.environ.get('ANTHROPIC_API_KEY') else '[NOT SET]'}", Colors.CYAN)
 
+        # 所有新环境变量先收集到字典中，最后一次性写入os.environ
+        # 认证变量成对计算（一个设置、另一个强制覆盖为空字符串）
+        new_env: Dict[str, str] = {}
         if platform_config.get("api_key"):
             # 设置 API Key 时，强制清理 AUTH TOKEN
-            os.environ["ANTHROPIC_API_KEY"] = platform_config["api_key"]
-            print(Colors.colorize(f"  -> Setting: ANTHROPIC_API_KEY = sk-***{platform_config['api_key'][-4:]}", Colors.GREEN))
-
-            # 强制覆盖为空字符串，确保没有冲突
-            os.environ["ANTHROPIC_AUTH_TOKEN"] = ""
-            print(Colors.colorize(f"  -> Force clearing: ANTHROPIC_AUTH_TOKEN = [EMPTY]", Colors.YELLOW))
+            new_env["ANTHROPIC_API_KEY"] = platform_config["api_key"]
+            new_env["ANTHROPIC_AUTH_TOKEN"] = ""
+            self._emit(f"  -> Setting: ANTHROPIC_API_KEY = sk-***{platform_config['api_key'][-4:]}", Colors.GREEN)
+            self._emit(f"  -> Force clearing: ANTHROPIC_AUTH_TOKEN = [EMPTY]", Colors.YELLOW)
 
         elif platform_config.get("auth_token"):
             # 设置 Auth Token 时，强制清理 API KEY
-            os.environ["ANTHROPIC_AUTH_TOKEN"] = platform_config["auth_token"]
-            print(Colors.colorize(f"  -> Setting: ANTHROPIC_AUTH_TOKEN = ***{platform_config['auth_token'][-4:]}", Colors.GREEN))
-
-            # 强制覆盖为空字符串，确保没有冲突
-            os.environ["ANTHROPIC_API_KEY"] = ""
-            print(Colors.colorize(f"  -> Force clearing: ANTHROPIC_API_KEY = [EMPTY]", Colors.YELLOW))
+            new_env["ANTHROPIC_AUTH_TOKEN"] = platform_config["auth_token"]
+            new_env["ANTHROPIC_API_KEY"] = ""
+            self._emit(f"  -> Setting: ANTHROPIC_AUTH_TOKEN = ***{platform_config['auth_token'][-4:]}", Colors.GREEN)
+            self._emit(f"  -> Force clearing: ANTHROPIC_API_KEY = [EMPTY]", Colors.YELLOW)
         # 注意：login_token 是 GAC Code 独有的用来查询余额的 token，不用于 Claude Code 认证
 
-        os.environ["ANTHROPIC_BASE_URL"] = platform_config["api_base_url"]
-        os.environ["ANTHROPIC_MODEL"] = platform_config["model"]
-        os.environ["ANTHROPIC_SMALL_FAST_MODEL"] = platform_config["small_model"]
+        new_env["ANTHROPIC_BASE_URL"] = platform_config["api_base_url"]
+        new_env["ANTHROPIC_MODEL"] = platform_config["model"]
+        new_env["ANTHROPIC_SMALL_FAST_MODEL"] = platform_config["small_model"]
 
         # 设置Claude Code配置变量（从平台配置中读取，如果有的话）
         # 根据错误信息，CLAUDE_CODE_MAX_OUTPUT_TOKENS是官方支持的变量
         claude_code_config = platform_config.get("claude_code_config", {})
 
         if claude_code_config.get("max_output_tokens"):
-            os.environ["CLAUDE_CODE_MAX_OUTPUT_TOKENS"] = str(
+            new_env["CLAUDE_CODE_MAX_OUTPUT_TOKENS"] = str(
                 claude_code_config["max_output_tokens"]
             )
-            print(
-                Colors.colorize(
-                    f"  -> CLAUDE_CODE_MAX_OUTPUT_TOKENS: {claude_code_config['max_output_tokens']}",
-                    Colors.GRAY,
-                )
+            self._emit(
+                f"  -> CLAUDE_CODE_MAX_OUTPUT_TOKENS: {claude_code_config['max_output_tokens']}",
+                Colors.GRAY,
             )
 
-        # Git Bash路径配置 (Windows) - 使用动态检测
-        possible_git_bash_paths = []
+        # Git Bash路径配置 (Windows) - 取第一个存在的候选路径
+        if git_bash_path is None:
+            git_bash_path = self._find_git_bash()
+        if git_bash_path:
+            new_env["CLAUDE_CODE_GIT_BASH_PATH"] = str(git_bash_path)
+            self._emit(
+                f"  -> CLAUDE_CODE_GIT_BASH_PATH set: {git_bash_path.name}",
+                Colors.GRAY,
+            )
 
-        # 1. 检查环境变量指向的Git安装
-        git_env_vars = [
-            ("GIT_INSTALL_PATH", "Git/bin/bash.exe"),
-            ("PROGRAMFILES", "Git/bin/bash.exe"),
-            ("PROGRAMFILES(X86)", "Git/bin/bash.exe"),
-            ("LOCALAPPDATA", "Programs/Git/bin/bash.exe"),
-        ]
-
-        for env_var, relative_path in git_env_vars:
-            if env_var in os.environ:
-                git_path = Path(os.environ[env_var]) / relative_path
-                if git_path.exists():
-                    possible_git_bash_paths.append(git_path)
-
-        # 2. Scoop安装路径 (用户目录下)
-        scoop_git = Path.home() / "scoop" / "apps" / "git" / "current" / "bin" / "bash.exe"
-        if scoop_git.exists():
-            possible_git_bash_paths.append(scoop_git)
-
-        # 3. 常见安装位置 (作为fallback，但先检查是否存在)
-        common_fallbacks = [
-            Path("C:/Program Files/Git/bin/bash.exe"),
-            Path("C:/Program Files (x86)/Git/bin/bash.exe"),
-        ]
-        possible_git_bash_paths.extend([p for p in common_fallbacks if p.exists()])
-
-        # 4. 用户自定义安装路径
-        user_install = Path.home() / "AppData" / "Local" / "Programs" / "Git" / "bin" / "bash.exe"
-        if user_install.exists():
-            possible_git_bash_paths.append(user_install)
-
-        for git_bash_path in possible_git_bash_paths:
-            if git_bash_path.exists():
-                os.environ["CLAUDE_CODE_GIT_BASH_PATH"] = str(git_bash_path)
-                print(
-                    Colors.colorize(
-                        f"  -> CLAUDE_CODE_GIT_BASH_PATH set: {git_bash_path.name}",
-                        Colors.GRAY,
-                    )
-                )
-                break
+        os.environ.update(new_env)
 
         # 验证环境变量设置，确保没有冲突
         auth_conflict = False
@@ -384,18 +632,20 @@ class ClaudeLauncher:
             auth_token_val = os.environ.get("ANTHROPIC_AUTH_TOKEN", "")
             if api_key_val and auth_token_val:  # 都非空才算冲突
                 auth_conflict = True
-                print(Colors.colorize("  [WARNING] Both ANTHROPIC_API_KEY and ANTHROPIC_AUTH_TOKEN are set!", Colors.RED))
-                print(Colors.colorize("     This may cause authentication conflicts with Claude Code.", Colors.RED))
+                self._emit("  [WARNING] Both ANTHROPIC_API_KEY and ANTHROPIC_AUTH_TOKEN are set!", Colors.RED)
+                self._emit("     This may cause authentication conflicts with Claude Code.", Colors.RED)
 
         if not auth_conflict:
-            print(Colors.colorize("Claude Code environment configured", Colors.GREEN))
+            self._emit("Claude Code environment configured", Colors.GREEN)
+
+        self._flush_output()
 
     def manage_session(self, selected_platform: str, continue_session: bool) -> str:
         """管理会话"""
-        print(Colors.colorize("\nManaging session...", Colors.CYAN))
+        self._emit("\nManaging session...", Colors.CYAN)
 
         if continue_session:
-            print(Colors.colorize("Continue session mode enabled", Colors.CYAN))
+            self._emit("Continue session mode enabled", Colors.CYAN)
 
         try:
             session = self.session_manager.create_session(
@@ -406,114 +656,285 @@ class ClaudeLauncher:
             prefixed_uuid = session.prefixed_uuid
             standard_uuid = session.standard_uuid
 
-            print(
-                Colors.colorize(
-                    f"Created dual UUID mapping: {prefixed_uuid} <-> {standard_uuid} -> {selected_platform}",
-                    Colors.GRAY,
-                )
+            self._emit(
+                f"Created dual UUID mapping: {prefixed_uuid} <-> {standard_uuid} -> {selected_platform}",
+                Colors.GRAY,
             )
+            self._flush_output()
 
             return session.session_id
         except Exception as e:
             self.log("ERROR", f"Session management failed: {e}", {"exception": str(e)})
             # 生成fallback session ID而不是完全失败
+            import uuid
+
             fallback_id = f"fallback-{str(uuid.uuid4())}"
             self.log("WARNING", f"Using fallback session ID: {fallback_id}")
             return fallback_id
 
-    def _detect_claude_command(self) -> Optional[List[str]]:
-        """智能检测Claude Code启动方式"""
+    def _resolve_executable(self, name: str) -> Optional[str]:
+        """解析可执行文件的绝对路径（兼容Windows的.cmd/.exe包装）"""
+        for candidate in (name, f"{name}.cmd", f"{name}.exe"):
+            exe_path = shutil.which(candidate)
+            if exe_path:
+                return exe_path
+        return None
+
+    def _load_cached_claude_cmd(self) -> Optional[List[str]]:
+        """读取缓存的Claude启动命令，可执行文件未变化时才有效"""
+        cached = safe_json_read(self.claude_cmd_cache_file)
+        cmd = cached.get("cmd")
+        if not cmd:
+            return None
+
+        # PATH未变化时直接验证缓存的可执行文件（一次stat），省去逐个PATH目录查找
+        if cached.get("path_key") == _path_key():
+            exe_path = cached.get("which")
+        else:
+            exe_path = self._resolve_executable(cmd[0])
+            if exe_path != cached.get("which"):
+                return None
+        if not exe_path:
+            return None
+
+        try:
+            stat = os.stat(exe_path)
+        except OSError:
+            return None
+
+        if stat.st_mtime_ns != cached.get("mtime_ns") or stat.st_size != cached.get(
+            "size"
+        ):
+            return None
+
+        self._claude_exe = exe_path
+        return cmd
+
+    def _save_claude_cmd_cache(self, cmd: List[str]) -> None:
+        """缓存探测到的Claude启动命令及可执行文件的mtime/大小"""
+        exe_path = self._claude_exe
+        if not exe_path:
+            return
+
+        try:
+            stat = os.stat(exe_path)
+        except OSError:
+            return
+
+        safe_json_write(
+            self.claude_cmd_cache_file,
+            {
+                "cmd": cmd,
+                "which": exe_path,
+                "path_key": _path_key(),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            },
+        )
+
+    def _detect_claude_command(
+        self, use_cache: bool = True
+    ) -> Tuple[Optional[List[str]], Optional[str]]:
+        """智能检测Claude Code启动方式（use_cache=False时忽略缓存强制重新探测）
+
+        可能在工作线程中运行，因此不直接输出，返回(启动命令, 版本输出)，
+        命令来自缓存时版本为None，未找到时命令为None
+        """
+        # 优先使用缓存的探测结果，避免每次启动都运行 --version 探测
+        cached_cmd = self._load_cached_claude_cmd() if use_cache else None
+        if cached_cmd:
+            return cached_cmd, None
+
         # 尝试不同的Claude Code启动方式
         claude_commands = [
             # 1. 直接的claude命令 (全局安装)
             ["claude"],
             # 2. npx claude (局部安装或fallback)
             ["npx", "@anthropic-ai/claude-code"],
-            # 3. node直接调用 (备用方案)
-            ["node", "-e", "require('@anthropic-ai/claude-code/cli')"],
-            # 4. pnpx claude (pnpm用户)
+            # 3. pnpx claude (pnpm用户)
             ["pnpx", "claude"],
-            # 5. yarn claude (yarn用户)
+            # 4. yarn claude (yarn用户)
             ["yarn", "claude"],
         ]
 
+        # 启动程序不在PATH中的候选命令直接跳过，省去一次进程创建
+        candidates = []
         for cmd in claude_commands:
-            try:
-                # 测试命令是否可用 - 运行 --version 检查
-                test_cmd = cmd + ["--version"]
-                result = subprocess.run(
-                    test_cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=10,
-                    shell=(os.name == "nt"),  # Windows需要shell=True
+            exe_path = self._resolve_executable(cmd[0])
+            if exe_path:
+                candidates.append((cmd, exe_path))
+
+        # 全局安装的claude优先单独探测，成功时不再启动包管理器（npx等可能联网解析包）
+        if candidates and candidates[0][0] == ["claude"]:
+            cmd, exe_path = candidates.pop(0)
+            output = self._probe_claude_command(cmd, exe_path)
+            if output is not None:
+                return self._use_detected_command(cmd, exe_path, output)
+
+        if not candidates:
+            return None, None
+
+        # 其余候选命令并发探测，按上面的优先级顺序取第一个成功的结果
+        probe_group = _ProbeGroup()
+        probe_executor = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = [
+                (
+                    cmd,
+                    exe_path,
+                    probe_executor.submit(
+                        self._probe_claude_command, cmd, exe_path, probe_group
+                    ),
                 )
+                for cmd, exe_path in candidates
+            ]
+            for cmd, exe_path, future in futures:
+                output = future.result()
+                if output is not None:
+                    return self._use_detected_command(cmd, exe_path, output)
+        finally:
+            # 已找到结果时终止优先级更低、仍在运行的探测子进程，不等待其线程结束
+            probe_group.kill_all()
+            probe_executor.shutdown(wait=False, cancel_futures=True)
+
+        return None, None
+
+    def _use_detected_command(
+        self, cmd: List[str], exe_path: str, output: str
+    ) -> Tuple[List[str], str]:
+        """记录探测成功的Claude启动命令并写入缓存"""
+        self._claude_exe = exe_path
+        self._save_claude_cmd_cache(cmd)
+        return cmd, output
+
+    def _report_detected_command(
+        self, cmd: List[str], version: Optional[str]
+    ) -> None:
+        """在主线程输出Claude启动命令的探测结果（version为None表示来自缓存）"""
+        if version is None:
+            self._emit(
+                f"Detected Claude Code via: {' '.join(cmd)} (cached)", Colors.GRAY
+            )
+        else:
+            self._emit(f"Detected Claude Code via: {' '.join(cmd)}", Colors.GRAY)
+            self._emit(f"Version: {version}", Colors.GRAY)
 
-                if result.returncode == 0:
-                    # 验证输出包含Claude Code相关信息
-                    output = result.stdout.strip()
-                    if "claude" in output.lower() or "anthropic" in output.lower():
-                        print(
-                            Colors.colorize(
-                                f"Detected Claude Code via: {' '.join(cmd)}",
-                                Colors.GRAY,
-                            )
-                        )
-                        print(Colors.colorize(f"Version: {output}", Colors.GRAY))
-                        return cmd
+    def _probe_claude_command(
+        self,
+        cmd: List[str],
+        exe_path: str,
+        probe_group: Optional[_ProbeGroup] = None,
+    ) -> Optional[str]:
+        """探测单个Claude启动命令（exe_path为解析出的绝对路径），可用时返回版本输出
+
+        并发探测时通过probe_group启动子进程，以便选出结果后终止其余探测
+        """
+        # 测试命令是否可用 - 运行 --version 检查（使用绝对路径直接执行）
+        # 只读取stdout原始字节，stdin/stderr不继承终端；直接安装的claude无需等待10秒，
+        # npx等包管理器首次运行可能需要解析/下载，保留更长的超时
+        # POSIX下close_fds=False可走posix_spawn（启动器打开的fd默认不可继承）
+        test_cmd = [exe_path] + cmd[1:] + ["--version"]
+        popen_kwargs = dict(
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            shell=_needs_shell(exe_path),  # 仅批处理脚本需要cmd.exe
+            close_fds=os.name == "nt",
+        )
+        try:
+            if probe_group is not None:
+                proc = probe_group.spawn(test_cmd, **popen_kwargs)
+                if proc is None:
+                    return None
+            else:
+                proc = subprocess.Popen(test_cmd, **popen_kwargs)
+            try:
+                stdout, _ = proc.communicate(timeout=5 if len(cmd) == 1 else 10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                return None
+        except (subprocess.SubprocessError, OSError):
+            # 这个命令不可用
+            return None
 
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.SubprocessError,
-                FileNotFoundError,
-            ):
-                # 这个命令不可用，尝试下一个
-                continue
+        if proc.returncode != 0:
+            return None
 
+        # 验证输出包含Claude Code相关信息（按字节匹配，命中后才解码用于显示）
+        output = stdout.strip()
+        lowered = output.lower()
+        if b"claude" in lowered or b"anthropic" in lowered:
+            return output.decode("utf-8", errors="replace")
         return None
 
     def _extract_standard_uuid(self, prefixed_session_id: str) -> str:
         """从2位平台ID前缀的session_id中提取标准UUID"""
-        import uuid
-
-        # 检查是否为带前缀的UUID（36位长度且第3位是'-'）
-        if len(prefixed_session_id) == 36 and prefixed_session_id[2] == "-":
-            # 移除前2位平台前缀，保留剩余部分作为标准UUID
-            standard_uuid = prefixed_session_id[2:]
+        standard_uuid = _parse_standard_uuid(prefixed_session_id)
+        if standard_uuid:
             return standard_uuid
 
-        # 如果已经是标准UUID格式（没有平台前缀），直接返回
-        if len(prefixed_session_id) == 36 and prefixed_session_id[2] != "-":
-            return prefixed_session_id
+        fallback_uuid = self._fallback_uuids.get(prefixed_session_id)
+        if fallback_uuid:
+            return fallback_uuid
 
         # 如果转换失败，生成新的标准UUID
-        fallback_uuid = str(uuid.uuid4())
+        import uuid
+
+        fallback_uuid = self._fallback_uuids[prefixed_session_id] = str(uuid.uuid4())
         self.log(
             "WARNING",
             f"Failed to convert {prefixed_session_id}, using new UUID: {fallback_uuid}",
         )
         return fallback_uuid
 
+    def _has_session_mapping(self, platform: str, *session_ids: str) -> bool:
+        """检查所有给定会话ID的映射是否都已存在且指向指定平台"""
+        if _get_session_platform is None:
+            return False
+        try:
+            return all(
+                _get_session_platform(session_id) == platform
+                for session_id in dict.fromkeys(session_ids)
+            )
+        except Exception:
+            return False
+
+    def _ensure_session_mapping(
+        self, session_id: str, standard_uuid: str, platform: str, continuing: bool
+    ) -> None:
+        """创建session映射；继续会话且两个UUID的映射都已指向同一平台时跳过写入
+
+        标准UUID的映射可能已过期或从未写入，只检查带前缀UUID会导致其无法修复
+        """
+        if continuing and self._has_session_mapping(
+            platform, session_id, standard_uuid
+        ):
+            return
+        self._create_dual_session_mapping(session_id, standard_uuid, platform)
+
     def _create_dual_session_mapping(
         self, prefixed_uuid: str, standard_uuid: str, platform: str
     ):
         """创建双向UUID映射（优先使用V2目录式存储）"""
+        if _set_session_platform is None:
+            self.log("ERROR", "SessionMapping V2 is not available", {})
+            return False
         try:
-            # 使用SessionMappingV2系统
-            from data.session_mapping_v2 import set_session_platform
-
             metadata = {
                 "prefixed_uuid": prefixed_uuid,
                 "standard_uuid": standard_uuid,
-                "created": datetime.now().isoformat(),
+                "created_ns": time.time_ns(),
                 "launcher_version": "v2",
             }
 
-            # 创建双向映射
-            success1 = set_session_platform(prefixed_uuid, platform, metadata)
-            success2 = set_session_platform(standard_uuid, platform, metadata)
+            # 创建双向映射（两个UUID相同时只需写入一次）
+            success1 = _set_session_platform(prefixed_uuid, platform, metadata)
+            success2 = (
+                success1
+                if standard_uuid == prefixed_uuid
+                else _set_session_platform(standard_uuid, platform, metadata)
+            )
 
             if success1 and success2:
                 self.log(
@@ -539,13 +960,23 @@ class ClaudeLauncher:
         continue_session: bool,
         remaining_args: List[str],
         platform_config: Dict[str, Any],
+        claude_cmd_future: Optional[Future] = None,
     ):
-        """启动Claude Code - 智能检测启动方式"""
-        print(Colors.colorize("\nLaunching Claude Code...", Colors.MAGENTA))
+        """启动Claude Code - 智能检测启动方式（可传入已提交的检测任务）
+
+        POSIX下无需恢复settings.json时以exec替换当前进程，此方法不会返回，
+        run()中的退出总结也不会输出
+        """
+        self._emit("\nLaunching Claude Code...", Colors.MAGENTA)
 
         # 智能检测Claude启动命令
-        claude_base_cmd = self._detect_claude_command()
-        if not claude_base_cmd:
+        if claude_cmd_future is not None:
+            claude_base_cmd, claude_version = claude_cmd_future.result()
+        else:
+            claude_base_cmd, claude_version = self._detect_claude_command()
+        if claude_base_cmd:
+            self._report_detected_command(claude_base_cmd, claude_version)
+        else:
             self.log(
                 "ERROR",
                 "Claude Code not found. Please install via one of these methods:",
@@ -560,11 +991,9 @@ class ClaudeLauncher:
 
         # 注意：--settings参数经测试无效，无法覆盖系统环境变量
         # 我们完全依赖环境变量清理和PowerShell隔离来实现配置
-        print(
-            Colors.colorize(
-                "Using environment variable isolation (no settings file dependency)",
-                Colors.CYAN,
-            )
+        self._emit(
+            "Using environment variable isolation (no settings file dependency)",
+            Colors.CYAN,
         )
 
         # 如果是继续会话模式，传递 --continue；否则传递 --session-id
@@ -578,26 +1007,22 @@ class ClaudeLauncher:
         claude_args.extend(remaining_args)
 
         command_string = " ".join(claude_args)
-        print(Colors.colorize(f"Executing: {command_string}", Colors.GREEN))
-        print(Colors.colorize("=" * 60, Colors.GRAY))
+        self._emit(f"Executing: {command_string}", Colors.GREEN)
+        self._emit("=" * 60, Colors.GRAY)
 
         # 执行Claude Code
         try:
             # 调试：确认环境变量设置
             max_tokens = os.environ.get("CLAUDE_CODE_MAX_OUTPUT_TOKENS")
             if max_tokens:
-                print(
-                    Colors.colorize(
-                        f"Debug: CLAUDE_CODE_MAX_OUTPUT_TOKENS={max_tokens} will be passed to Claude Code",
-                        Colors.CYAN,
-                    )
+                self._emit(
+                    f"Debug: CLAUDE_CODE_MAX_OUTPUT_TOKENS={max_tokens} will be passed to Claude Code",
+                    Colors.CYAN,
                 )
             else:
-                print(
-                    Colors.colorize(
-                        "Warning: CLAUDE_CODE_MAX_OUTPUT_TOKENS not found in environment!",
-                        Colors.YELLOW,
-                    )
+                self._emit(
+                    "Warning: CLAUDE_CODE_MAX_OUTPUT_TOKENS not found in environment!",
+                    Colors.YELLOW,
                 )
 
             # 使用智能环境变量设置方法
@@ -605,45 +1030,69 @@ class ClaudeLauncher:
 
             # 显示环境变量设置信息
             if platform_config.get("api_key"):
-                print(Colors.colorize(f"  -> Subprocess env override: ANTHROPIC_API_KEY=sk-***{platform_config['api_key'][-4:]}", Colors.GREEN))
-                print(Colors.colorize(f"  -> Subprocess env override: ANTHROPIC_AUTH_TOKEN=[EMPTY]", Colors.YELLOW))
+                self._emit(f"  -> Subprocess env override: ANTHROPIC_API_KEY=sk-***{platform_config['api_key'][-4:]}", Colors.GREEN)
+                self._emit(f"  -> Subprocess env override: ANTHROPIC_AUTH_TOKEN=[EMPTY]", Colors.YELLOW)
             elif platform_config.get("auth_token"):
-                print(Colors.colorize(f"  -> Subprocess env override: ANTHROPIC_AUTH_TOKEN=***{platform_config['auth_token'][-4:]}", Colors.GREEN))
-                print(Colors.colorize(f"  -> Subprocess env override: ANTHROPIC_API_KEY=[EMPTY]", Colors.YELLOW))
-            print(Colors.colorize(f"  -> Subprocess env override: ANTHROPIC_BASE_URL={platform_config['api_base_url']}", Colors.CYAN))
+                self._emit(f"  -> Subprocess env override: ANTHROPIC_AUTH_TOKEN=***{platform_config['auth_token'][-4:]}", Colors.GREEN)
+                self._emit(f"  -> Subprocess env override: ANTHROPIC_API_KEY=[EMPTY]", Colors.YELLOW)
+            self._emit(f"  -> Subprocess env override: ANTHROPIC_BASE_URL={platform_config['api_base_url']}", Colors.CYAN)
 
             # 调试：显示关键环境变量
-            print(Colors.colorize(f"  -> Debug: PATH exists: {'PATH' in clean_env}", Colors.CYAN))
+            self._emit(f"  -> Debug: PATH exists: {'PATH' in clean_env}", Colors.CYAN)
             if 'PATH' in clean_env:
-                print(Colors.colorize(f"  -> Debug: PATH length: {len(clean_env['PATH'])}", Colors.CYAN))
+                self._emit(f"  -> Debug: PATH length: {len(clean_env['PATH'])}", Colors.CYAN)
 
-            # 测试命令是否真的存在
-            cmd_path = shutil.which(claude_args[0])
-            print(Colors.colorize(f"  -> Debug: which('{claude_args[0]}') = {cmd_path}", Colors.CYAN))
+            # 测试命令是否真的存在（优先复用探测时解析出的路径）
+            cmd_path = self._claude_exe or self._resolve_executable(claude_args[0])
+            self._emit(f"  -> Debug: which('{claude_args[0]}') = {cmd_path}", Colors.CYAN)
 
-            # 如果找到了完整路径，使用完整路径
+            # 如果找到了完整路径，使用完整路径；npm的claude.cmd直接改用node运行，不经过cmd.exe
             if cmd_path:
-                print(Colors.colorize(f"  -> Using full path: {cmd_path}", Colors.GREEN))
+                self._emit(f"  -> Using full path: {cmd_path}", Colors.GREEN)
                 claude_args[0] = cmd_path
+                if len(claude_base_cmd) == 1:
+                    shim_target = _unwrap_npm_claude_shim(cmd_path)
+                    if shim_target:
+                        claude_args[:1] = shim_target
 
             # 验证环境变量是否真的被设置
-            print(Colors.colorize(f"  -> Final verification in subprocess env:", Colors.CYAN))
-            print(Colors.colorize(f"     ANTHROPIC_API_KEY = {'[SET]' if clean_env.get('ANTHROPIC_API_KEY') else '[NOT SET]'}", Colors.CYAN))
-            print(Colors.colorize(f"     ANTHROPIC_AUTH_TOKEN = {'[SET]' if clean_env.get('ANTHROPIC_AUTH_TOKEN') else '[NOT SET]'}", Colors.CYAN))
-            print(Colors.colorize(f"     ANTHROPIC_BASE_URL = {clean_env.get('ANTHROPIC_BASE_URL', '[NOT SET]')}", Colors.CYAN))
+            self._emit(f"  -> Final verification in subprocess env:", Colors.CYAN)
+            self._emit(f"     ANTHROPIC_API_KEY = {'[SET]' if clean_env.get('ANTHROPIC_API_KEY') else '[NOT SET]'}", Colors.CYAN)
+            self._emit(f"     ANTHROPIC_AUTH_TOKEN = {'[SET]' if clean_env.get('ANTHROPIC_AUTH_TOKEN') else '[NOT SET]'}", Colors.CYAN)
+            self._emit(f"     ANTHROPIC_BASE_URL = {clean_env.get('ANTHROPIC_BASE_URL', '[NOT SET]')}", Colors.CYAN)
 
             # 关键修复：临时修改settings.json文件
-            print(Colors.colorize(f"  -> Temporarily modifying settings.json to clear env conflicts", Colors.YELLOW))
+            self._emit(f"  -> Temporarily modifying settings.json to clear env conflicts", Colors.YELLOW)
             backup_settings_path = self._modify_settings_json_temporarily(platform_config)
 
+            # 无需在退出后恢复settings.json时，直接用Claude Code替换当前进程，
+            # 不再保留一个空闲等待的Python父进程（Windows的exec语义不同，仍使用子进程）
+            if backup_settings_path is None and os.name != "nt":
+                # exec后Python缓冲区不会再被写出，先全部刷新
+                self._flush_output()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.execvpe(claude_args[0], claude_args, clean_env)
+
+            # 启动前一次性写出本步骤缓冲的全部输出
+            self._flush_output()
             try:
-                result = subprocess.run(claude_args, env=clean_env, shell=(os.name == "nt"))
+                # POSIX下claude_args[0]已是绝对路径，配合close_fds=False（Python打开的fd
+                # 默认不可继承）可让subprocess走posix_spawn快速路径；
+                # 不要添加preexec_fn/cwd等参数，否则会退回fork+exec
+                result = subprocess.run(
+                    claude_args,
+                    env=clean_env,
+                    shell=_needs_shell(claude_args[0]),
+                    close_fds=os.name == "nt",
+                )
             finally:
                 # 恢复原始settings.json
                 if backup_settings_path and backup_settings_path.exists():
-                    print(Colors.colorize(f"  -> Restoring original settings.json", Colors.GRAY))
+                    self._emit(f"  -> Restoring original settings.json", Colors.GRAY)
                     self._restore_settings_json(backup_settings_path)
-                    print(Colors.colorize(f"  -> Settings.json restored", Colors.GREEN))
+                    self._emit(f"  -> Settings.json restored", Colors.GREEN)
+                    self._flush_output()
             return result.returncode
         except FileNotFoundError:
             self.log("ERROR", "Claude Code executable not found", {})
@@ -665,6 +1114,23 @@ class ClaudeLauncher:
 
     def run(self, args: List[str]):
         """主运行逻辑"""
+        # 独立的I/O步骤（配置预加载、Git Bash路径探测、Claude启动命令探测）放到线程池并发执行
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            # 配置解析与头部输出、参数解析重叠进行；config_manager属性在工作线程中
+            # 求值，config模块的导入和ConfigManager的构建都不阻塞主线程
+            config_future = executor.submit(lambda: self.config_manager.load_config())
+            return self._run_with_executor(args, executor, config_future)
+        finally:
+            executor.shutdown(wait=True)
+            self._flush_output()
+
+    def _run_with_executor(
+        self, args: List[str], executor: ThreadPoolExecutor, config_future: Future
+    ) -> int:
+        """主运行逻辑（启动阶段的独立探测在executor中并发执行）"""
+        import argparse
+
         self.print_header()
 
         # 解析参数
@@ -677,15 +1143,25 @@ class ClaudeLauncher:
         parser.add_argument(
             "-c", "--continue", action="store_true", help="Continue existing session"
         )
+        parser.add_argument(
+            "--refresh-claude-cmd",
+            action="store_true",
+            help="Ignore the cached Claude Code command and probe again",
+        )
         parser.add_argument(
             "remaining_args", nargs="*", help="Additional arguments for Claude Code"
         )
 
         parsed_args = parser.parse_args(args)
 
+        # Git Bash仅在Windows上需要，其他平台不提交探测任务
+        git_bash_future = (
+            executor.submit(self._find_git_bash) if os.name == "nt" else None
+        )
+
         # 加载配置
         self.log("INFO", "Loading platform configuration...")
-        config = self.load_config()
+        config = self.load_config(config_future)
 
         # 解析平台
         selected_platform, platform_config = self.resolve_platform(
@@ -699,18 +1175,23 @@ class ClaudeLauncher:
             ]
         )
 
-        print(
-            Colors.colorize(
-                f"Selected Platform: {platform_config['name']} ({selected_platform})",
-                Colors.GREEN,
-            )
+        self._emit(
+            f"Selected Platform: {platform_config['name']} ({selected_platform})",
+            Colors.GREEN,
         )
-        print(Colors.colorize(f"   Enabled Platforms: {enabled_count}", Colors.GRAY))
+        self._emit(f"   Enabled Platforms: {enabled_count}", Colors.GRAY)
 
         # 配置已由统一配置管理器处理，无需同步
 
         # 设置环境
-        self.setup_environment(platform_config)
+        self.setup_environment(
+            platform_config, git_bash_future.result() if git_bash_future else None
+        )
+
+        # 环境变量设置完成后再探测Claude启动命令，与会话管理并发执行
+        claude_cmd_future = executor.submit(
+            self._detect_claude_command, not parsed_args.refresh_claude_cmd
+        )
 
         # 管理会话
         session_id = self.manage_session(
@@ -718,24 +1199,33 @@ class ClaudeLauncher:
         )
 
         # 创建session映射（session_id已经是正确的带前缀UUID）
-        self._create_dual_session_mapping(session_id, session_id, selected_platform)
+        # 标准UUID只计算一次；与带前缀UUID相同时映射只写入一次
+        standard_uuid = _parse_standard_uuid(session_id) or session_id
+        # 继续会话且映射已指向同一平台时无需重复写入
+        self._ensure_session_mapping(
+            session_id,
+            standard_uuid,
+            selected_platform,
+            getattr(parsed_args, "continue"),
+        )
 
         # 显示会话信息
-        print(Colors.colorize("Session ready", Colors.GREEN))
-        print(Colors.colorize(f"   UUID: {session_id}", Colors.GREEN))
-        print(Colors.colorize(f"   Standard UUID: {session_id}", Colors.GRAY))
-        print(Colors.colorize(f"   Platform: {selected_platform}", Colors.GREEN))
-        print(Colors.colorize(f"   Model: {platform_config['model']}", Colors.GREEN))
+        self._emit("Session ready", Colors.GREEN)
+        self._emit(f"   UUID: {session_id}", Colors.GREEN)
+        self._emit(f"   Standard UUID: {standard_uuid}", Colors.GRAY)
+        self._emit(f"   Platform: {selected_platform}", Colors.GREEN)
+        self._emit(f"   Model: {platform_config['model']}", Colors.GREEN)
         if getattr(parsed_args, "continue"):
-            print(Colors.colorize("   Mode: Continue existing session", Colors.YELLOW))
+            self._emit("   Mode: Continue existing session", Colors.YELLOW)
         else:
-            print(Colors.colorize("   Mode: New session", Colors.CYAN))
+            self._emit("   Mode: New session", Colors.CYAN)
 
         # 配置摘要
-        print(Colors.colorize("\nConfiguration Summary:", Colors.YELLOW))
-        print(Colors.colorize(f"   Platform: {platform_config['name']}", Colors.NC))
-        print(Colors.colorize(f"   Session: {session_id}", Colors.GRAY))
-        print(Colors.colorize(f"   Model: {platform_config['model']}", Colors.GRAY))
+        self._emit("\nConfiguration Summary:", Colors.YELLOW)
+        self._emit(f"   Platform: {platform_config['name']}", Colors.NC)
+        self._emit(f"   Session: {session_id}", Colors.GRAY)
+        self._emit(f"   Model: {platform_config['model']}", Colors.GRAY)
+        self._flush_output()
 
         # 启动 Claude Code（传递带前缀的 UUID 用于平台检测）
         exit_code = self.launch_claude(
@@ -743,20 +1233,18 @@ class ClaudeLauncher:
             getattr(parsed_args, "continue"),
             parsed_args.remaining_args,
             platform_config,
+            claude_cmd_future,
         )
 
         # 清理和总结
-        print(Colors.colorize("\n" + "=" * 60, Colors.GRAY))
+        self._emit("\n" + "=" * 60, Colors.GRAY)
         if exit_code == 0:
-            print(Colors.colorize("Session completed successfully!", Colors.GREEN))
+            self._emit("Session completed successfully!", Colors.GREEN)
         else:
-            print(
-                Colors.colorize(
-                    f"Claude Code exited with error code: {exit_code}", Colors.RED
-                )
-            )
-        print(Colors.colorize(f"   Platform: {platform_config['name']}", Colors.NC))
-        print(Colors.colorize(f"   UUID: {session_id}", Colors.GRAY))
+            self._emit(f"Claude Code exited with error code: {exit_code}", Colors.RED)
+        self._emit(f"   Platform: {platform_config['name']}", Colors.NC)
+        self._emit(f"   UUID: {session_id}", Colors.GRAY)
+        self._flush_output()
 
         return exit_code
 
@@ -826,8 +1314,8 @@ class ClaudeLauncher:
 
     def _modify_settings_json_temporarily(self, platform_config: Dict[str, Any]) -> Optional[Path]:
         """Temporarily modify settings.json and return backup path"""
-        user_settings_path = Path.home() / ".claude" / "settings.json"
-        backup_settings_path = Path.home() / ".claude" / "settings.json.backup"
+        user_settings_path = _CLAUDE_SETTINGS_FILE
+        backup_settings_path = _CLAUDE_SETTINGS_BACKUP
 
         if not user_settings_path.exists():
             return None
@@ -835,15 +1323,16 @@ class ClaudeLauncher:
         try:
             # 备份原始settings.json
             shutil.copy2(user_settings_path, backup_settings_path)
-            print(Colors.colorize(f"  -> Backed up settings.json to settings.json.backup", Colors.GRAY))
+            self._emit(f"  -> Backed up settings.json to settings.json.backup", Colors.GRAY)
 
-            # 读取并修改settings.json
-            with open(user_settings_path, "r", encoding="utf-8") as f:
-                settings_data = json.load(f)
+            # 读取并修改settings.json（一次读取字节，utf-8-sig兼容带BOM的文件）
+            settings_data = json.loads(
+                user_settings_path.read_bytes().decode("utf-8-sig")
+            )
 
             # 保存原始env配置用于调试
             original_env = settings_data.get("env", {})
-            print(Colors.colorize(f"  -> Original env in settings.json: {list(original_env.keys())}", Colors.CYAN))
+            self._emit(f"  -> Original env in settings.json: {list(original_env.keys())}", Colors.CYAN)
 
             # 设置正确的环境变量配置
             settings_data["env"] = self._create_settings_env_config(platform_config)
@@ -852,17 +1341,16 @@ class ClaudeLauncher:
             with open(user_settings_path, "w", encoding="utf-8") as f:
                 json.dump(settings_data, f, indent=2, ensure_ascii=False)
 
-            print(Colors.colorize(f"  -> Updated env configuration in settings.json", Colors.GREEN))
+            self._emit(f"  -> Updated env configuration in settings.json", Colors.GREEN)
             return backup_settings_path
         except Exception as e:
-            print(Colors.colorize(f"  -> Warning: Failed to modify settings.json: {e}", Colors.RED))
+            self._emit(f"  -> Warning: Failed to modify settings.json: {e}", Colors.RED)
             return None
 
     def _restore_settings_json(self, backup_settings_path: Optional[Path]):
         """Restore original settings.json from backup"""
         if backup_settings_path and backup_settings_path.exists():
-            user_settings_path = Path.home() / ".claude" / "settings.json"
-            shutil.move(backup_settings_path, user_settings_path)
+            shutil.move(backup_settings_path, _CLAUDE_SETTINGS_FILE)
 
 
 def main():
@@ -106,7 +106,7 @@ class CacheManager:
         if params:
             # 对参数进行排序和哈希，确保一致性
             param_str = json.dumps(params, sort_keys=True, separators=(",", ":"))
-            param_hash = hashlib.md5(param_str.encode()).hexdigest()[:8]
+            param_hash = hashlib.blake2s(param_str.encode(), digest_size=4).hexdigest()
             return f"{namespace}:{key}:{param_hash}"
         return f"{namespace}:{key}"
 
@@ -7,8 +7,9 @@ Unified Configuration Manager
 
 import json
 import os
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import sys
 
@@ -40,7 +41,10 @@ class ConfigManager:
         self._cache_timestamp: Optional[datetime] = None
 
         # 配置文件变更监听
-        self._last_modified: Optional[float] = None
+        self._last_modified: Optional[int] = None
+
+        # 外部平台配置解析缓存：(路径, mtime_ns, 配置内容)，文件未变化时不再重新解析
+        self._external_config_cache: Optional[Tuple[Path, int, Dict[str, Any]]] = None
 
     def _get_default_config(self) -> Dict[str, Any]:
         """获取默认配置结构"""
@@ -106,25 +110,29 @@ class ConfigManager:
             "logging": {"level": "INFO", "enabled": True},
         }
 
-    def _should_reload_config(self) -> bool:
-        """检查是否需要重新加载配置"""
-        if not self.unified_config_file.exists():
-            return True
+    def _get_config_mtime_ns(self) -> Optional[int]:
+        """获取配置文件的修改时间（纳秒），文件不存在时返回None"""
+        try:
+            return os.stat(self.unified_config_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
+    def _should_reload_config(self, current_mtime: Optional[int]) -> bool:
+        """检查是否需要重新加载配置（current_mtime为本次已获取的修改时间）"""
         if self._config_cache is None:
             return True
 
-        # 检查文件修改时间
-        current_mtime = self.unified_config_file.stat().st_mtime
-        if self._last_modified is None or current_mtime > self._last_modified:
+        # 文件不存在或修改时间变化时需要重新加载
+        if current_mtime is None or current_mtime != self._last_modified:
             return True
 
         return False
 
     def load_config(self) -> Dict[str, Any]:
-        """加载配置"""
-        if self._should_reload_config():
-            if self.unified_config_file.exists():
+        """加载配置（每次调用只stat一次配置文件）"""
+        current_mtime = self._get_config_mtime_ns()
+        if self._should_reload_config(current_mtime):
+            if current_mtime is not None:
                 config = safe_json_read(self.unified_config_file)
                 if config is None:
                     log_message(
@@ -143,16 +151,13 @@ class ConfigManager:
             except Exception as e:
                 log_message("config", "WARNING", f"Failed to sync external config: {e}")
 
-            # 保存配置（如果第一次创建）
-            if not self.unified_config_file.exists():
+            # 保存配置（如果第一次创建，save_config会记录新文件的修改时间）
+            if current_mtime is None:
                 self.save_config(config)
+            else:
+                self._last_modified = current_mtime
 
             self._config_cache = config
-            self._last_modified = (
-                self.unified_config_file.stat().st_mtime
-                if self.unified_config_file.exists()
-                else None
-            )
 
         return self._config_cache.copy()
 
@@ -165,7 +170,7 @@ class ConfigManager:
 
         if safe_json_write(self.unified_config_file, safe_config):
             self._config_cache = config.copy()  # 缓存使用原始配置（包含密钥）
-            self._last_modified = self.unified_config_file.stat().st_mtime
+            self._last_modified = self._get_config_mtime_ns()
             log_message(
                 "config", "INFO", f"Configuration saved to {self.unified_config_file}"
             )
@@ -311,8 +316,6 @@ class ConfigManager:
         # 优先级1: Session ID 映射
         if session_id:
             try:
-                from pathlib import Path
-
                 mapping_file = (
                     self.project_dir / "data" / "cache" / "session-mappings.json"
                 )
@@ -365,6 +368,21 @@ class ConfigManager:
         log_message("config", "WARNING", "No configured platform with API key found, falling back to GAC Code")
         return "gaccode"
 
+    def _read_external_config(self, config_path: Path) -> Optional[Dict[str, Any]]:
+        """读取外部平台配置，文件不存在时返回None，未变化时复用上次解析结果"""
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            return None
+
+        cache = self._external_config_cache
+        if cache and cache[0] == config_path and cache[1] == mtime_ns:
+            return cache[2]
+
+        external_config = safe_json_read(config_path)
+        self._external_config_cache = (config_path, mtime_ns, external_config)
+        return external_config
+
     def sync_external_platforms_config_to_config(self, config: Dict[str, Any]) -> bool:
         """将外部平台配置同步到指定配置对象（不保存）"""
         try:
@@ -383,14 +401,25 @@ class ConfigManager:
             ]
 
             for config_path in external_config_paths:
-                if config_path.exists():
+                external_config = self._read_external_config(config_path)
+                if external_config is not None:
                     log_message("config", "INFO", f"Syncing platforms config from: {config_path}")
-                    external_config = safe_json_read(config_path)
 
                     if external_config:
-                        # 合并平台配置
+                        # 合并平台配置（复制每个平台的配置，避免修改缓存的解析结果）
                         if "platforms" in external_config:
-                            config["platforms"].update(external_config["platforms"])
+                            config["platforms"].update(
+                                {
+                                    name: (
+                                        dict(platform_config)
+                                        if isinstance(platform_config, dict)
+                                        else platform_config
+                                    )
+                                    for name, platform_config in external_config[
+                                        "platforms"
+                                    ].items()
+                                }
+                            )
                             log_message("config", "DEBUG", f"Synced {len(external_config['platforms'])} platforms")
                             updated = True
 
@@ -501,8 +530,6 @@ class ConfigManager:
 
         pattern = patterns.get(platform)
         if pattern:
-            import re
-
             return bool(re.match(pattern, key))
 
         # 通用验证：至少20个字符，包含字母数字
@@ -8,7 +8,9 @@ Cross-platform file locking utility
 import os
 import sys
 import json
+import stat
 import time
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Optional
 from contextlib import contextmanager
@@ -27,6 +29,30 @@ try:
 except ImportError:
     HAS_FCNTL = False
 
+try:
+    # 可选的高性能JSON库
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# UTF-8 BOM（配置文件可能由Windows编辑器保存）
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def json_loads(data: bytes) -> Any:
+    """解析JSON字节，自动去掉UTF-8 BOM（优先使用orjson）"""
+    if data.startswith(_UTF8_BOM):
+        data = data[3:]
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """序列化为缩进2格的UTF-8 JSON字节（优先使用orjson）"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
 
 class FileLockError(Exception):
     """文件锁定异常"""
@@ -125,21 +151,61 @@ def _fallback_file_operation(file_path: Path, mode: str, encoding: str, timeout:
 
 def safe_json_write(file_path: Path, data: Dict[str, Any], timeout: int = 5) -> bool:
     """
-    安全的JSON文件写入（带文件锁定）
+    安全的JSON文件写入（写入临时文件后原子替换）
+
+    原子替换保证读取方只会看到完整的旧内容或新内容，取代了原先写入时的文件锁
+    （该锁只覆盖截断后的写入本身，从不覆盖调用方的读-改-写；现有调用方均未在
+    safe_file_lock中执行读-改-写）。目标为符号链接时替换其指向的真实文件，
+    并保留原文件的权限位（新文件为0644）。
     
     Args:
         file_path: 文件路径
         data: 要写入的数据
-        timeout: 锁定超时时间
+        timeout: 替换目标文件的重试超时时间
     
     Returns:
         bool: 写入是否成功
     """
+    tmp_path = None
     try:
-        with safe_file_lock(file_path, "w", "utf-8-sig", timeout) as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        payload = json_dumps(data)
+
+        # 解析符号链接，替换真实文件而不是把链接本身替换为普通文件
+        target_path = Path(os.path.realpath(file_path))
+
+        # mkstemp创建的文件权限为0600，替换前恢复目标文件原有的权限位
+        try:
+            file_mode = stat.S_IMODE(os.stat(target_path).st_mode)
+        except FileNotFoundError:
+            file_mode = 0o644
+
+        # 先完整写入同目录下的临时文件，读取方不会看到写了一半的内容
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{target_path.name}.", suffix=".tmp", dir=target_path.parent
+        )
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), file_mode)
+            f.write(payload)
+
+        start_time = time.time()
+        while True:
+            try:
+                os.replace(tmp_path, target_path)
+                break
+            except PermissionError:
+                # Windows上目标文件被其他进程打开时无法替换，短暂等待后重试
+                if time.time() - start_time >= timeout:
+                    raise
+                time.sleep(0.1)
         return True
     except Exception as e:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
         # 导入日志记录函数（避免循环导入）
         try:
             from .logger import log_message
@@ -173,8 +239,9 @@ def safe_json_read(file_path: Path, default: Optional[Dict[str, Any]] = None, ti
     
     while time.time() - start_time < timeout:
         try:
-            with open(file_path, "r", encoding="utf-8-sig") as f:
-                return json.load(f)
+            # 一次读取全部字节后解析，无需文本解码层
+            with open(file_path, "rb", buffering=65536) as f:
+                return json_loads(f.read())
         except json.JSONDecodeError as e:
             # JSON格式错误，记录日志并返回默认值
             try:
@@ -64,6 +64,18 @@ class InputValidator:
             r'~[/\\]',  # 用户目录符号
             r'[<>|"*?]',  # Windows不允许的字符
         ]
+
+        # 预先解析允许的路径前缀字符串，供str.startswith一次匹配
+        self._allowed_prefix_strs = self._resolve_prefixes(self.allowed_path_prefixes)
+
+        # 危险路径模式合并为一个正则，快速判断是否需要逐条定位
+        self._dangerous_path_re = re.compile(
+            "|".join(f"(?:{p})" for p in self.dangerous_path_patterns)
+        )
+        # 逐条定位用的预编译模式（保持列表顺序）
+        self._dangerous_path_res = tuple(
+            (p, re.compile(p)) for p in self.dangerous_path_patterns
+        )
         
         # 允许的文件扩展名
         self.allowed_extensions = {
@@ -90,6 +102,17 @@ class InputValidator:
             'session_id': string.ascii_letters + string.digits + '-'
         }
     
+    @staticmethod
+    def _resolve_prefixes(prefixes: List[Path]) -> Tuple[str, ...]:
+        """解析允许的路径前缀，忽略无法解析的路径"""
+        resolved = []
+        for prefix in prefixes:
+            try:
+                resolved.append(str(prefix.resolve()))
+            except (OSError, ValueError):
+                continue
+        return tuple(resolved)
+
     def validate_path_security(self, path: Union[str, Path], context: str = "path") -> Path:
         """验证路径安全性，防止路径遍历攻击"""
         if isinstance(path, str):
@@ -99,12 +122,13 @@ class InputValidator:
         
         path_str = str(path_obj)
         
-        # 1. 检查危险模式
-        for pattern in self.dangerous_path_patterns:
-            if re.search(pattern, path_str):
-                raise SecurityViolationError(
-                    f"Dangerous path pattern detected in {context}: {pattern}"
-                )
+        # 1. 检查危险模式（合并正则未命中时无需逐条检查）
+        if self._dangerous_path_re.search(path_str):
+            for pattern, compiled in self._dangerous_path_res:
+                if compiled.search(path_str):
+                    raise SecurityViolationError(
+                        f"Dangerous path pattern detected in {context}: {pattern}"
+                    )
         
         # 2. 解析路径并检查遍历
         try:
@@ -113,19 +137,7 @@ class InputValidator:
             raise ValidationError(f"Invalid path in {context}: {e}")
         
         # 3. 检查是否在允许的目录范围内
-        is_allowed = False
-        resolved_str = str(resolved_path)
-        
-        for allowed_prefix in self.allowed_path_prefixes:
-            try:
-                allowed_str = str(allowed_prefix.resolve())
-                if resolved_str.startswith(allowed_str):
-                    is_allowed = True
-                    break
-            except (OSError, ValueError):
-                continue
-        
-        if not is_allowed:
+        if not str(resolved_path).startswith(self._allowed_prefix_strs):
             raise SecurityViolationError(
                 f"Path outside allowed directories in {context}: {resolved_path}"
             )
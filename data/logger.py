@@ -127,75 +127,80 @@ def log_launcher_execution(platform: str, session_id: str, command: str, status:
     log_message("launcher", "INFO", f"Launcher execution: {status}", extra_data)
 
 
+# 文本脱敏规则：(正则, 替换)，按顺序依次应用
+_SENSITIVE_TEXT_RULES = [
+    # API Keys - Various formats
+    (r'sk-[a-zA-Z0-9\-_]{20,100}', lambda m: f"sk-***{m.group()[-4:]}"),
+    (r'api[_-]?key["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']', lambda m: f"api_key=\"***{m.group(1)[-4:]}\""),
+    
+    # Bearer Tokens
+    (r'Bearer [a-zA-Z0-9+/=_-]{20,}', lambda m: f"Bearer ***{m.group().split()[-1][-4:]}"),
+    (r'Authorization:\s*Bearer\s+([a-zA-Z0-9+/=_-]{20,})', lambda m: f"Authorization: Bearer ***{m.group(1)[-4:]}"),
+    
+    # JWT Tokens (starts with eyJ)
+    (r'eyJ[a-zA-Z0-9+/=_-]{20,}', lambda m: f"jwt-***{m.group()[-8:]}"),
+    
+    # OpenAI style keys
+    (r'sk-proj-[a-zA-Z0-9_-]{20,100}', lambda m: f"sk-proj-***{m.group()[-6:]}"),
+    
+    # Anthropic API keys
+    (r'sk-ant-[a-zA-Z0-9_-]{20,100}', lambda m: f"sk-ant-***{m.group()[-6:]}"),
+    
+    # DeepSeek API keys
+    (r'sk-[a-fA-F0-9]{32}', lambda m: f"sk-***{m.group()[-6:]}"),
+    
+    # Generic long tokens (be more specific to avoid false positives)
+    (r'[a-zA-Z0-9+/=_-]{40,}(?=\s|$|[,;\}\]\)])', 
+     lambda m: f"***{m.group()[-6:]}" if len(m.group()) > 40 else "***"),
+    
+    # Authorization headers  
+    (r'(auth[a-z]*[_-]?token|access[_-]?token|refresh[_-]?token)["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']',
+     lambda m: f"{m.group(1)}=\"***{m.group(2)[-4:]}\""),
+    
+    # Login tokens
+    (r'login[_-]?token["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']',
+     lambda m: f"login_token=\"***{m.group(1)[-4:]}\""),
+    
+    # Session IDs (UUIDs)
+    (r'session[_-]?id["\']?\s*[:=]\s*["\']?([a-fA-F0-9-]{32,36})["\']?',
+     lambda m: f"session_id=\"{m.group(1)[:8]}-***-{m.group(1)[-4:]}\""),
+    
+    # Credit card patterns
+    (r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b', '****-****-****-****'),
+    
+    # Email addresses (partial masking)
+    (r'([a-zA-Z0-9._%+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', 
+     lambda m: f"{m.group(1)[:2]}***@{m.group(2)}"),
+    
+    # Phone numbers
+    (r'\b\+?[1-9]\d{1,14}\b', lambda m: f"***{m.group()[-4:]}"),
+    
+    # IP Addresses (partial masking for privacy)
+    (r'\b(?:\d{1,3}\.){3}\d{1,3}\b', lambda m: f"{'.'.join(m.group().split('.')[:2])}.***.**"),
+    
+    # URLs with credentials
+    (r'https?://([^:]+):([^@]+)@', lambda m: f"https://{m.group(1)[:3]}***:***@"),
+    
+    # Database connection strings
+    (r'(password|pwd)[=:]([^;\s&"\']\S+)', lambda m: f"{m.group(1)}=***{m.group(2)[-2:]}"),
+]
+
+# 预编译（模块加载时一次），所有规则均不区分大小写
+_SENSITIVE_TEXT_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in _SENSITIVE_TEXT_RULES
+)
+
+
 def mask_sensitive_data(text: str) -> str:
     """屏蔽文本中的敏感信息 - 增强版"""
     if not isinstance(text, str):
         return text
         
-    patterns = [
-        # API Keys - Various formats
-        (r'sk-[a-zA-Z0-9\-_]{20,100}', lambda m: f"sk-***{m.group()[-4:]}"),
-        (r'api[_-]?key["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']', lambda m: f"api_key=\"***{m.group(1)[-4:]}\""),
-        
-        # Bearer Tokens
-        (r'Bearer [a-zA-Z0-9+/=_-]{20,}', lambda m: f"Bearer ***{m.group().split()[-1][-4:]}"),
-        (r'Authorization:\s*Bearer\s+([a-zA-Z0-9+/=_-]{20,})', lambda m: f"Authorization: Bearer ***{m.group(1)[-4:]}"),
-        
-        # JWT Tokens (starts with eyJ)
-        (r'eyJ[a-zA-Z0-9+/=_-]{20,}', lambda m: f"jwt-***{m.group()[-8:]}"),
-        
-        # OpenAI style keys
-        (r'sk-proj-[a-zA-Z0-9_-]{20,100}', lambda m: f"sk-proj-***{m.group()[-6:]}"),
-        
-        # Anthropic API keys
-        (r'sk-ant-[a-zA-Z0-9_-]{20,100}', lambda m: f"sk-ant-***{m.group()[-6:]}"),
-        
-        # DeepSeek API keys
-        (r'sk-[a-fA-F0-9]{32}', lambda m: f"sk-***{m.group()[-6:]}"),
-        
-        # Generic long tokens (be more specific to avoid false positives)
-        (r'[a-zA-Z0-9+/=_-]{40,}(?=\s|$|[,;\}\]\)])', 
-         lambda m: f"***{m.group()[-6:]}" if len(m.group()) > 40 else "***"),
-        
-        # Authorization headers  
-        (r'(auth[a-z]*[_-]?token|access[_-]?token|refresh[_-]?token)["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']',
-         lambda m: f"{m.group(1)}=\"***{m.group(2)[-4:]}\""),
-        
-        # Login tokens
-        (r'login[_-]?token["\']?\s*[:=]\s*["\']([^"\']\S{15,})["\']',
-         lambda m: f"login_token=\"***{m.group(1)[-4:]}\""),
-        
-        # Session IDs (UUIDs)
-        (r'session[_-]?id["\']?\s*[:=]\s*["\']?([a-fA-F0-9-]{32,36})["\']?',
-         lambda m: f"session_id=\"{m.group(1)[:8]}-***-{m.group(1)[-4:]}\""),
-        
-        # Credit card patterns
-        (r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b', '****-****-****-****'),
-        
-        # Email addresses (partial masking)
-        (r'([a-zA-Z0-9._%+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', 
-         lambda m: f"{m.group(1)[:2]}***@{m.group(2)}"),
-        
-        # Phone numbers
-        (r'\b\+?[1-9]\d{1,14}\b', lambda m: f"***{m.group()[-4:]}"),
-        
-        # IP Addresses (partial masking for privacy)
-        (r'\b(?:\d{1,3}\.){3}\d{1,3}\b', lambda m: f"{'.'.join(m.group().split('.')[:2])}.***.**"),
-        
-        # URLs with credentials
-        (r'https?://([^:]+):([^@]+)@', lambda m: f"https://{m.group(1)[:3]}***:***@"),
-        
-        # Database connection strings
-        (r'(password|pwd)[=:]([^;\s&"\']\S+)', lambda m: f"{m.group(1)}=***{m.group(2)[-2:]}"),
-    ]
-    
     result = text
-    for pattern, replacement in patterns:
+    for pattern, replacement in _SENSITIVE_TEXT_PATTERNS:
         try:
-            if callable(replacement):
-                result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-            else:
-                result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+            result = pattern.sub(replacement, result)
         except Exception as e:
             # If regex fails, continue with other patterns
             continue
@@ -203,91 +208,96 @@ def mask_sensitive_data(text: str) -> str:
     return result
 
 
-def mask_sensitive_dict(data: dict) -> dict:
-    """屏蔽字典中的敏感信息 - 增强版"""
-    if not isinstance(data, dict):
-        return data
-    
-    # 扩展的敏感键名列表
-    sensitive_keys = {
-        'api_key', 'auth_token', 'login_token', 'password', 'secret', 'passwd',
-        'private_key', 'access_token', 'refresh_token', 'client_secret',
-        'api_secret', 'webhook_secret', 'encryption_key', 'session_token',
-        'bearer_token', 'oauth_token', 'jwt_token', 'auth_key', 'token',
-        'key', 'credential', 'credentials', 'auth', 'authentication',
-        'session_id', 'user_id', 'client_id', 'app_secret', 'app_key',
-        'database_url', 'db_password', 'db_pass', 'redis_url', 'mongo_url'
-    }
-    
-    # 敏感值模式（用于检测看起来像密钥的值）
-    sensitive_value_patterns = [
-        r'^sk-[a-zA-Z0-9\-_]{20,}$',  # OpenAI style keys
-        r'^eyJ[a-zA-Z0-9+/=_-]{20,}$',  # JWT tokens
-        r'^[a-fA-F0-9]{32,64}$',  # Hex keys
-        r'^[a-zA-Z0-9+/=]{32,}$',  # Base64-like keys
-    ]
-    
-    def is_sensitive_value(value: str) -> bool:
-        """检查值是否看起来像敏感信息"""
-        if not isinstance(value, str) or len(value) < 15:
-            return False
-        
-        for pattern in sensitive_value_patterns:
-            if re.match(pattern, value):
-                return True
+# 扩展的敏感键名列表
+_SENSITIVE_DICT_KEYS = frozenset({
+    'api_key', 'auth_token', 'login_token', 'password', 'secret', 'passwd',
+    'private_key', 'access_token', 'refresh_token', 'client_secret',
+    'api_secret', 'webhook_secret', 'encryption_key', 'session_token',
+    'bearer_token', 'oauth_token', 'jwt_token', 'auth_key', 'token',
+    'key', 'credential', 'credentials', 'auth', 'authentication',
+    'session_id', 'user_id', 'client_id', 'app_secret', 'app_key',
+    'database_url', 'db_password', 'db_pass', 'redis_url', 'mongo_url'
+})
+
+# 敏感值模式（用于检测看起来像密钥的值，模块加载时编译一次）
+_SENSITIVE_VALUE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'^sk-[a-zA-Z0-9\-_]{20,}$',  # OpenAI style keys
+    r'^eyJ[a-zA-Z0-9+/=_-]{20,}$',  # JWT tokens
+    r'^[a-fA-F0-9]{32,64}$',  # Hex keys
+    r'^[a-zA-Z0-9+/=]{32,}$',  # Base64-like keys
+))
+
+
+def _is_sensitive_value(value: str) -> bool:
+    """检查值是否看起来像敏感信息"""
+    if not isinstance(value, str) or len(value) < 15:
         return False
     
-    def mask_value(value, key_name: str = ""):
-        """智能掩码值"""
-        if isinstance(value, str):
-            if len(value) > 4:
-                if len(value) > 20:  # Long strings get more masking
-                    return f"***{value[-4:]}"
-                else:
-                    return f"***{value[-2:]}"
+    for pattern in _SENSITIVE_VALUE_PATTERNS:
+        if pattern.match(value):
+            return True
+    return False
+
+
+def _mask_value(value, key_name: str = ""):
+    """智能掩码值"""
+    if isinstance(value, str):
+        if len(value) > 4:
+            if len(value) > 20:  # Long strings get more masking
+                return f"***{value[-4:]}"
             else:
-                return "***"
+                return f"***{value[-2:]}"
         else:
             return "***"
+    else:
+        return "***"
+
+
+def _process_value(key: str, value, depth: int = 0):
+    """递归处理值"""
+    # 防止无限递归
+    if depth > 10:
+        return value
     
-    def process_value(key: str, value, depth: int = 0):
-        """递归处理值"""
-        # 防止无限递归
-        if depth > 10:
-            return value
-        
-        if isinstance(value, dict):
-            return mask_sensitive_dict_recursive(value, depth + 1)
-        elif isinstance(value, list):
-            return [process_value(f"{key}[{i}]", item, depth + 1) for i, item in enumerate(value)]
-        elif isinstance(value, str):
-            # 总是对字符串应用文本掩码
-            masked_text = mask_sensitive_data(value)
-            return masked_text
-        else:
-            return value
+    if isinstance(value, dict):
+        return _mask_sensitive_dict_recursive(value, depth + 1)
+    elif isinstance(value, list):
+        return [_process_value(f"{key}[{i}]", item, depth + 1) for i, item in enumerate(value)]
+    elif isinstance(value, str):
+        # 总是对字符串应用文本掩码
+        masked_text = mask_sensitive_data(value)
+        return masked_text
+    else:
+        return value
+
+
+def _mask_sensitive_dict_recursive(data: dict, depth: int = 0) -> dict:
+    """递归掩码字典"""
+    masked = {}
     
-    def mask_sensitive_dict_recursive(data: dict, depth: int = 0) -> dict:
-        """递归掩码字典"""
-        masked = {}
+    for key, value in data.items():
+        key_lower = key.lower()
         
-        for key, value in data.items():
-            key_lower = key.lower()
-            
-            # 检查键名是否敏感
-            is_key_sensitive = any(sensitive in key_lower for sensitive in sensitive_keys)
-            
-            # 检查值是否看起来敏感
-            is_value_sensitive = isinstance(value, str) and is_sensitive_value(value)
-            
-            if is_key_sensitive or is_value_sensitive:
-                masked[key] = mask_value(value, key)
-            else:
-                masked[key] = process_value(key, value, depth)
+        # 检查键名是否敏感
+        is_key_sensitive = any(sensitive in key_lower for sensitive in _SENSITIVE_DICT_KEYS)
+        
+        # 检查值是否看起来敏感
+        is_value_sensitive = isinstance(value, str) and _is_sensitive_value(value)
         
-        return masked
+        if is_key_sensitive or is_value_sensitive:
+            masked[key] = _mask_value(value, key)
+        else:
+            masked[key] = _process_value(key, value, depth)
+    
+    return masked
+
+
+def mask_sensitive_dict(data: dict) -> dict:
+    """屏蔽字典中的敏感信息 - 增强版（键名集合、值模式和处理函数均在模块级定义一次）"""
+    if not isinstance(data, dict):
+        return data
     
-    return mask_sensitive_dict_recursive(data)
+    return _mask_sensitive_dict_recursive(data)
 
 
 def clean_log_file(log_file_path: str) -> bool:
@@ -55,6 +55,11 @@ class BasePlatform(ABC):
 
     def close(self):
         """Close the HTTP session"""
+        # 释放后台任务集成持有的缓存文件fd
+        integration = getattr(self, "_background_integration", None)
+        if integration is not None:
+            integration.close()
+
         if hasattr(self, "_session") and self._session and not self._session_closed:
             try:
                 self._session.close()
@@ -14,9 +14,13 @@ import sys
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# 共享的JSON解析（orjson优先、自动去掉UTF-8 BOM）
+from data.file_lock import json_loads
+
 # Import unified cache manager
 try:
-    sys.path.insert(0, str(Path(__file__).parent.parent))
     from cache import get_cache_manager
 except ImportError:
     get_cache_manager = None  # 向后兼容
@@ -99,8 +103,7 @@ class GACCodePlatform(BasePlatform):
             return False
 
         try:
-            with open(cache_file, "r", encoding="utf-8-sig") as f:
-                cache_data = json.load(f)
+            cache_data = json_loads(cache_file.read_bytes())
 
             # 使用内容中的时间戳而不是文件修改时间
             cached_at_str = cache_data.get("cached_at")
@@ -121,8 +124,7 @@ class GACCodePlatform(BasePlatform):
             return None
 
         try:
-            with open(cache_file, "r", encoding="utf-8-sig") as f:
-                cache_data = json.load(f)
+            cache_data = json_loads(cache_file.read_bytes())
             return cache_data.get("data")
         except Exception:
             return None
@@ -269,8 +271,7 @@ class GACCodePlatform(BasePlatform):
             return {"segments": {}, "last_updated": None}
 
         try:
-            with open(self._multiplier_cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return json_loads(self._multiplier_cache_file.read_bytes())
         except Exception:
             return {"segments": {}, "last_updated": None}
 
@@ -288,8 +289,7 @@ class GACCodePlatform(BasePlatform):
             return True
 
         try:
-            with open(self._history_cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+            cache_data = json_loads(self._history_cache_file.read_bytes())
 
             cached_at_str = cache_data.get("cached_at")
             if not cached_at_str:
@@ -308,8 +308,7 @@ class GACCodePlatform(BasePlatform):
         # 检查是否需要更新缓存
         if not self._should_update_history_cache():
             try:
-                with open(self._history_cache_file, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
+                cached_data = json_loads(self._history_cache_file.read_bytes())
                 return cached_data.get("data")
             except Exception:
                 pass  # 缓存读取失败，继续API调用
@@ -335,8 +334,7 @@ class GACCodePlatform(BasePlatform):
 
         # API调用失败，尝试使用已有缓存
         try:
-            with open(self._history_cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
+            cached_data = json_loads(self._history_cache_file.read_bytes())
             return cached_data.get("data")
         except Exception:
             return None
@@ -856,8 +854,7 @@ class GACCodePlatform(BasePlatform):
 
         if self._refill_cache_file.exists():
             try:
-                with open(self._refill_cache_file, "r", encoding="utf-8-sig") as f:
-                    refill_data = json.load(f)
+                refill_data = json_loads(self._refill_cache_file.read_bytes())
                 last_refill_date = refill_data.get("last_refill_date")
                 return last_refill_date == today  # 返回是否为今日
             except Exception:
@@ -934,8 +931,7 @@ class GACCodePlatform(BasePlatform):
             # 1. 检查是否已有其他进程在进行refill
             if lock_file.exists():
                 try:
-                    with open(lock_file, "r", encoding="utf-8") as f:
-                        lock_data = json.load(f)
+                    lock_data = json_loads(lock_file.read_bytes())
                     
                     lock_time = datetime.fromisoformat(lock_data["locked_at"])
                     current_time = datetime.now()
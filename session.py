@@ -8,6 +8,7 @@ Unified Session Manager
 import json
 import uuid
 import hashlib
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
@@ -366,8 +367,6 @@ class UnifiedSessionManager:
 
     def _save_session(self, session: SessionInfo) -> bool:
         """保存会话信息（使用SessionMappingV2格式）"""
-        import time
-        
         # 使用SessionMappingV2的目录结构
         session_file = self._get_session_file_path(session.session_id)
         
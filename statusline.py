@@ -1053,12 +1053,12 @@ def fetch_platform_subscription_data(platform, config):
 def ensure_background_tasks(platform):
     """确保平台的后台任务正在运行"""
     try:
-        from background.daemon_manager import DaemonManager
+        from background.daemon_manager import get_daemon_manager
         from pathlib import Path
         
         # 获取data目录
         data_dir = Path(__file__).parent / "data"
-        daemon_manager = DaemonManager(data_dir)
+        daemon_manager = get_daemon_manager(data_dir)
         
         # 检查后台任务是否运行
         platform_name = platform.name.lower()
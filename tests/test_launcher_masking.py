@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动器日志脱敏测试 - 粘连在一起的 sk/Bearer/JWT 令牌都必须被屏蔽
+运行: python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "bin"))
+sys.path.insert(0, str(PROJECT_DIR / "data"))
+
+from launcher import SimpleLogger  # noqa: E402
+
+SK_KEY = "sk-" + "a" * 40 + "Y11"
+JWT = "eyJc+9" + "A" * 30 + "wxyz"
+BEARER = "Bearer " + "b" * 30 + "tail"
+
+
+class TestLauncherMasking(unittest.TestCase):
+    def setUp(self):
+        self.mask = SimpleLogger()._mask_sensitive_data
+
+    def assert_no_secret(self, masked: str, *secrets: str):
+        for secret in secrets:
+            self.assertNotIn(secret, masked)
+
+    def test_plain_text_unchanged(self):
+        text = "Launching Claude Code with platform gaccode"
+        self.assertIs(self.mask(text), text)
+
+    def test_single_tokens(self):
+        self.assertEqual(self.mask(f"key={SK_KEY}"), "key=sk-***aY11")
+        self.assertEqual(self.mask(f"auth {BEARER}"), "auth Bearer ***tail")
+        self.assertEqual(self.mask(f"jwt {JWT}"), "jwt jwt-***wxyz")
+
+    def test_jwt_glued_after_sk_key(self):
+        masked = self.mask(SK_KEY + JWT)
+        self.assertEqual(masked, "sk-***jwt-***wxyz")
+        self.assert_no_secret(masked, "A" * 20)
+
+    def test_sk_key_glued_after_jwt(self):
+        masked = self.mask(JWT + SK_KEY)
+        self.assert_no_secret(masked, "a" * 20, "A" * 20)
+
+    def test_sk_key_glued_after_bearer(self):
+        masked = self.mask(BEARER + SK_KEY)
+        self.assert_no_secret(masked, "a" * 20, "b" * 20)
+
+    def test_bearer_jwt_and_sk_run_together(self):
+        masked = self.mask(f"Bearer {JWT}{SK_KEY}{JWT}")
+        self.assert_no_secret(masked, "a" * 20, "A" * 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
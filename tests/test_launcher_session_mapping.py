@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动器会话映射测试 - 继续会话时标准UUID映射缺失必须被重新写入
+运行: python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "bin"))
+sys.path.insert(0, str(PROJECT_DIR / "data"))
+
+import launcher  # noqa: E402
+
+PREFIXED_UUID = "gc-0e8400-e29b-41d4-a716-446655440000"
+STANDARD_UUID = "-0e8400-e29b-41d4-a716-446655440000"
+
+
+class TestEnsureSessionMapping(unittest.TestCase):
+    def setUp(self):
+        self.mappings = {}
+
+        def set_platform(session_id, platform, metadata=None):
+            self.mappings[session_id] = platform
+            return True
+
+        patches = [
+            mock.patch.object(
+                launcher, "_get_session_platform", self.mappings.get
+            ),
+            mock.patch.object(launcher, "_set_session_platform", set_platform),
+            mock.patch.object(launcher.ClaudeLauncher, "log"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.launcher = launcher.ClaudeLauncher()
+
+    def ensure(self, continuing: bool):
+        self.launcher._ensure_session_mapping(
+            PREFIXED_UUID, STANDARD_UUID, "gaccode", continuing
+        )
+
+    def test_new_session_writes_both_mappings(self):
+        self.ensure(continuing=False)
+        self.assertEqual(
+            self.mappings, {PREFIXED_UUID: "gaccode", STANDARD_UUID: "gaccode"}
+        )
+
+    def test_continue_repairs_missing_standard_mapping(self):
+        self.mappings[PREFIXED_UUID] = "gaccode"
+        self.ensure(continuing=True)
+        self.assertEqual(self.mappings.get(STANDARD_UUID), "gaccode")
+
+    def test_continue_repairs_standard_mapping_to_other_platform(self):
+        self.mappings[PREFIXED_UUID] = "gaccode"
+        self.mappings[STANDARD_UUID] = "kimi"
+        self.ensure(continuing=True)
+        self.assertEqual(self.mappings[STANDARD_UUID], "gaccode")
+
+    def test_continue_skips_write_when_both_mappings_match(self):
+        self.mappings[PREFIXED_UUID] = "gaccode"
+        self.mappings[STANDARD_UUID] = "gaccode"
+        with mock.patch.object(
+            self.launcher, "_create_dual_session_mapping"
+        ) as create:
+            self.ensure(continuing=True)
+        create.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()